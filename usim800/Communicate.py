@@ -2,48 +2,75 @@ import serial
 import time
 import re
 import json
+from functools import lru_cache
+
+
+@lru_cache(maxsize=64)
+def _encode_cmd(cmd, end="\r\n"):
+    # Fixed commands (SAPBR, HTTPINIT, CID, ...) repeat on every request;
+    # bounded so per-request URL commands cannot grow it without limit.
+    return (cmd + end).encode("ascii", errors="ignore")
+
 
 class communicate:
+    # Raw-serial helper kept for the original info/sms classes.
+    # New code goes through usim800.at.ATChannel (see Request.request).
 
     cmd_list = []
 
     def __init__(self, port):
         self._port = port
 
+    def _read_chunk(self):
+        """Return everything pyserial has buffered (at least 1 byte, or b"")."""
+        return self._port.read(max(1, self._port.in_waiting))
+
     def _setcmd(self, cmd, end='\r\n'):
         return cmd + end
 
+    def _encoded(self, cmd, end='\r\n'):
+        return _encode_cmd(cmd, end)
+
     def _readtill(self, till="OK", timeout=5.0):
-        buf = b""
-        start = time.time()
-        while True:
-            chunk = self._port.read(1)
+        buf = bytearray()
+        terminators = (till.encode(errors="ignore"), b"ERROR")
+        # Overlap each scan by len(terminator) - 1 so a terminator split
+        # across two chunks is still found; nothing is decoded here.
+        overlap = max(len(t) for t in terminators) - 1
+        scan_from = 0
+        # Hard deadline: a modem that keeps sending without a terminator
+        # (URC noise, long bodies) must not extend the wait indefinitely.
+        # When nothing is buffered, read(1) blocks inside pyserial for at most
+        # the port timeout, so this loop does not spin.
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            chunk = self._read_chunk()
             if chunk:
-                buf += chunk
-                try:
-                    text = buf.decode(errors="ignore")
-                except Exception:
-                    text = ""
-                if till in text or "ERROR" in text:
-                    return buf
-            else:
-                if time.time() - start > timeout:
-                    return buf
+                buf.extend(chunk)
+                tail = max(0, scan_from - overlap)
+                hits = [i for i in (buf.find(t, tail) for t in terminators) if i != -1]
+                if hits:
+                    return bytes(buf)
+                scan_from = len(buf)
+        return bytes(buf)
 
     def _send_cmd(
         self,
         cmd,
-        t=0.1,
+        t=0,
         bytes=14816,
         return_data=False,
         printio=False,
         get_decode_data=False,
         read=True,
+        timeout=2.0,
     ):
-        out = self._setcmd(cmd)
+        # `bytes` is no longer used: the reply is read up to OK/ERROR (or
+        # `timeout`) instead of a fixed-size blind read. `t` is kept as an
+        # optional extra delay for callers that still pass one.
         if printio:
-            print(">>", out.strip())
-        self._port.write(out.encode("ascii", errors="ignore"))
+            print(">>", cmd.strip())
+        self._port.write(self._encoded(cmd))
 
         data = None
 
@@ -54,7 +81,7 @@ class communicate:
             if get_decode_data:
                 data = None
             else:
-                data = self._port.read(bytes)
+                data = self._readtill(till="OK", timeout=timeout)
                 if printio and data:
                     try:
                         print("<<", data.decode(errors="ignore"))
@@ -63,40 +90,3 @@ class communicate:
 
         if return_data:
             return data
-
-    def _read_sent_data(self, size, t=0.1):
-        if t:
-            time.sleep(t)
-        return self._port.read(size)
-
-    def _getdata(
-        self,
-        data_to_decode=None,
-        string_to_decode=None,
-        till=b"\n",
-        count=2,
-        counter=0,
-        timeout=5.0,
-    ):
-        if data_to_decode is None:
-            data_to_decode = []
-
-        occurrences = counter
-        start = time.time()
-
-        while True:
-            rcv = self._port.read(1)
-            if not rcv:
-                if time.time() - start > timeout:
-                    break
-                else:
-                    continue
-
-            data_to_decode.append(rcv)
-
-            if rcv == till:
-                occurrences += 1
-                if occurrences >= count:
-                    break
-
-        return b"".join(data_to_decode)
@@ -31,8 +31,10 @@ class ATJSONObjectParser:
         while True:
             match_c = processText.find('{', pos)
             match_s = processText.find('[', pos)
+            # Prefer '[' only when it directly wraps the '{' ("[{...}]");
+            # a missing bracket (-1) must not count as adjacent.
             dif = abs(match_c-match_s)
-            if dif == 1:
+            if dif == 1 and -1 not in (match_c, match_s):
                 match = text.find('[', pos)
             else:
                 match = text.find('{', pos)
@@ -1,42 +1,64 @@
-from usim800.Parser.ATParser import Parser
 from usim800.Parser import JsonParser
-from usim800.Communicate import communicate
+from usim800.exceptions import HTTPError
+from usim800.http import HTTP
 
-import time
-import re
+from contextlib import contextmanager
 
+try:
+    import orjson as _json  # optional, much faster on large bodies
+except ImportError:  # pragma: no cover
+    import json as _json
 
-class request(communicate):
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+class request:
+
+    def __init__(self, at):
+        # at: usim800.at.ATChannel (owns the serial port and the modem lock)
+        self._at = at
+        self._http = HTTP(at, cid=1)
 
         self._status_code = None
+        # Exact HTTPREAD payload; text/json are derived on first access
+        self._raw_body = None
         self._json = None
         self._text = None
-        self._content = None
         self._url = None
         self._IP = None
         self._APN = None
+        self._bearer_open = False
+        # HTTPPARA "CONTENT" already sent in the current HTTP service
+        self._last_content_type = None
 
     def init(self):
         self._status_code = None
+        self._raw_body = None
         self._json = None
         self._text = None
-        self._content = None
         self._url = None
-        self._IP = None
+        if not self._bearer_open:
+            # IP stays valid for the lifetime of an open session
+            self._IP = None
 
     @property
     def text(self):
+        if self._text is None and self.content is not None:
+            self._text = self.content.decode()
         return self._text
 
     @property
     def content(self):
-        return self._content
+        return self._raw_body
 
     @property
     def json(self):
+        # List of JSON documents in the body, as ATJSONObjectParser returns.
+        # Plain JSON bodies take the fast path; the scanning extractor is
+        # only used for bodies with text around the JSON.
+        if self._json is None and self._raw_body is not None:
+            try:
+                self._json = [_json.loads(self._raw_body)]
+            except ValueError:
+                self._json = JsonParser.ATJSONObjectParser(self._raw_body).JSONObject
         return self._json
 
     @property
@@ -70,32 +92,34 @@ class request(communicate):
             raise ValueError("APN is not set on request object")
 
         # CONTYPE / APN
-        self._send_cmd('AT+SAPBR=3,1,"CONTYPE","GPRS"')
-        self._send_cmd(f'AT+SAPBR=3,1,"APN","{self._APN}"')
-
-        # Otvori bearer
-        self._send_cmd("AT+SAPBR=1,1")
-        data = self._send_cmd("AT+SAPBR=2,1", return_data=True)
-
-        if data:
-            # očekivani format: +SAPBR: 1,1,"10.123.45.67"
-            m = re.search(rb'"([^"]+)"', data)
-            if m:
-                self._IP = m.group(1).decode(errors="ignore")
+        self._at.command_batch([
+            'AT+SAPBR=3,1,"CONTYPE","GPRS"',
+            f'AT+SAPBR=3,1,"APN","{self._APN}"',
+        ], timeout_s=2)
+
+        # Otvori bearer (ERROR here usually means it is already open)
+        self._at.command("AT+SAPBR=1,1", timeout_s=90, expect_ok=False)
+        resp = self._at.command("AT+SAPBR=2,1", timeout_s=2)
+
+        # očekivani format: +SAPBR: 1,1,"10.123.45.67"
+        _, _, line = resp.raw.partition(b"+SAPBR:")
+        _, _, rest = line.partition(b'"')
+        ip, _, _ = rest.partition(b'"')
+        if ip:
+            self._IP = ip.decode(errors="ignore")
 
         return self._IP
 
     def _close_bearer(self):
-        self._send_cmd("AT+SAPBR=0,1")
+        self._at.command("AT+SAPBR=0,1", timeout_s=20, expect_ok=False)
 
     def _http_init(self):
-        # best effort cleanup
-        self._send_cmd("AT+HTTPTERM")
-        self._send_cmd("AT+HTTPINIT")
-        self._send_cmd('AT+HTTPPARA="CID",1')
+        self._http.init()
+        # HTTPINIT starts with default parameters
+        self._last_content_type = None
 
     def _http_term(self):
-        self._send_cmd("AT+HTTPTERM")
+        self._http.term()
 
     # ------------------------------------------------------------------
     # Internnal GET/POST for session
@@ -104,42 +128,25 @@ class request(communicate):
     def _http_get_internal(self, url, header=None):
         self._url = url
 
-        # URL
-        self._send_cmd(f'AT+HTTPPARA="URL","{url}"')
-
-        if header:
-            header_str = "\\r\\n".join(f"{k}: {v}" for k, v in header.items())
-            self._send_cmd(f'AT+HTTPPARA="USERDATA","{header_str}"')
+        # URL (+ USERDATA) in one batched write
+        self._http.set_params(url, headers=header, timeout_s=2)
 
         # HTTPACTION=0 (GET)
-        self._send_cmd("AT+HTTPACTION=0")
-        time.sleep(2)
-
-        self._send_cmd("AT+HTTPREAD", get_decode_data=True)
-        data = self._getdata(
-            data_to_decode=[],
-            string_to_decode=None,
-            till=b"\n",
-            count=2,
-            counter=0,
-        )
-
-        tk = Parser(data)
-        token = tk.tokenizer()
-        self._content = tk.parser
-
-        if len(token) == 4:
-            self._status_code = token[2]
-            read_bytes = int(token[3])
-
-            string = self._read_sent_data(read_bytes + 1000)
-            tk2 = Parser(string)
-            self._content = tk2.bytesparser
-            self._text = tk2.parser
-
-            jph = JsonParser.ATJSONObjectParser(string)
-            self._json = jph.JSONObject
+        return self._read_action_response(method=0)
 
+    def _read_action_response(self, method, timeout=60.0):
+        # HTTPACTION + wait for the URC + exact-length HTTPREAD
+        try:
+            resp = self._http._action_and_read(method, read_timeout_s=timeout)
+        except HTTPError as e:
+            if e.status_code is None:
+                raise
+            # 60x stack errors are reported as status codes, as before
+            self._status_code = str(e.status_code)
+            return self._status_code
+
+        self._status_code = str(resp.status_code)
+        self._raw_body = resp.data
         return self._status_code
 
     def _http_post_internal(
@@ -150,7 +157,7 @@ class request(communicate):
         waittime=3000,
         content_type="application/json",
     ):
-
+        # bytes_data is kept for compatibility; HTTPDATA uses len(body)
         self._url = url
 
         if isinstance(data, str):
@@ -158,74 +165,58 @@ class request(communicate):
         else:
             body = data
 
-        if bytes_data is None:
-            bytes_data = len(body)
-
-        # URL + CONTENT-TYPE
-        self._send_cmd(f'AT+HTTPPARA="URL","{url}"')
-        self._send_cmd(f'AT+HTTPPARA="CONTENT","{content_type}"')
-
-        # HTTPDATA
-        cmd = f"AT+HTTPDATA={bytes_data},{waittime}"
-        self._send_cmd(cmd)
-
-        self._port.write(body)
-        time.sleep(4)
-
-        # HTTPACTION=1 (POST)
-        self._send_cmd("AT+HTTPACTION=1")
-        time.sleep(4)
-
-        # HTTPREAD
-        self._send_cmd("AT+HTTPREAD", get_decode_data=True)
-        data_resp = self._getdata(
-            data_to_decode=[],
-            string_to_decode=None,
-            till=b"\n",
-            count=2,
-            counter=0,
+        # URL + CONTENT-TYPE (only when changed) in one batched write
+        changed = content_type != self._last_content_type
+        self._http.set_params(
+            url, content_type=content_type if changed else None, timeout_s=2
         )
+        self._last_content_type = content_type
 
-        tk = Parser(data_resp)
-        self._content = tk.parser
-        token = tk.tokenizer()
-
-        if len(token) == 4:
-            self._status_code = token[2]
-            read_bytes = int(token[3])
-            string = self._read_sent_data(read_bytes + 1000)
+        # HTTPDATA: DOWNLOAD prompt, body, OK
+        self._http._upload(body, httpdata_timeout_ms=waittime)
 
-            tk2 = Parser(string)
-            self._content = tk2.bytesparser
-            self._text = tk2.parser
-
-            jph = JsonParser.ATJSONObjectParser(string)
-            self._json = jph.JSONObject
+        # HTTPACTION=1 (POST)
+        return self._read_action_response(method=1)
 
-        return self._status_code
+    # ------------------------------------------------------------------
+    # Session: keep bearer + HTTP service open across requests
+    # ------------------------------------------------------------------
 
-    def get(self, url, header=None):
-        self.init()
-        self._IP = self._bearer(self._APN)
+    @contextmanager
+    def session(self, apn=None):
+        """
+        Open the bearer and HTTP service once for several get()/post() calls.
+
+            with gsm.requests.session(apn="www") as r:
+                r.get(url1)
+                r.get(url2)
+        """
+        if self._bearer_open:
+            # Nested use: the outer session owns setup/teardown
+            yield self
+            return
+
+        self._IP = self._bearer(apn or self._APN)
         self._http_init()
+        self._bearer_open = True
         try:
-            return self._http_get_internal(url, header=header)
+            yield self
         finally:
-            # cleanup
+            self._bearer_open = False
             self._http_term()
             self._close_bearer()
 
+    def get(self, url, header=None):
+        self.init()
+        with self.session():
+            return self._http_get_internal(url, header=header)
+
     def post(self, url, data, bytes_data, waittime=3000):
         self.init()
-        self._IP = self._bearer(self._APN)
-        self._http_init()
-        try:
+        with self.session():
             return self._http_post_internal(
                 url=url,
                 data=data,
                 bytes_data=bytes_data,
                 waittime=waittime,
             )
-        finally:
-            self._http_term()
-            self._close_bearer()
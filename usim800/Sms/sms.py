@@ -1,6 +1,8 @@
 
 from usim800.Communicate import communicate
 
+_HEX_CHARS = frozenset('0123456789abcdef')
+
 def _try_decode_utf16_encoded_string(s):
     # Check if the input string is a valid UTF-16 hex string. If it is, decode it. Otherwise, return it as-is. 
     #   is_utf16_encoded_string('60A87684') == '您的'
@@ -10,7 +12,7 @@ def _try_decode_utf16_encoded_string(s):
     if len(prepared) % 4 != 0:
         return s
     for c in prepared:
-        if c not in '0123456789abcdef':
+        if c not in _HEX_CHARS:
             return s
     # It is an utf16 encoded string. Let's decode it. 
     result_str = ''
@@ -34,6 +36,7 @@ def _parse_cmgl_response(cmgl_response_str):
         if line.startswith(ENTRY_HEADLINE_PREFIX):
             # New entry starts! End the previous entry and parse the new one. 
             if curr_entry is not None:
+                curr_entry[-1] = ''.join(curr_entry[-1])
                 result_dict[curr_entry[0]] = (curr_entry)
                 curr_entry = None
             
@@ -47,7 +50,7 @@ def _parse_cmgl_response(cmgl_response_str):
             # Parsed. Now fill the curr_entry
             curr_entry = headline_fields
             curr_entry[0] = msg_id
-            curr_entry.append('') # Body text
+            curr_entry.append([]) # Body text parts, joined when the entry ends
         else:
             # This line might be body of an entry, might be junk data. 
             if curr_entry is None:
@@ -57,10 +60,11 @@ def _parse_cmgl_response(cmgl_response_str):
             if line.strip().lower() == 'ok':
                 break
             # Not junk... Let's add text to curr_entry
-            curr_entry[-1] += _try_decode_utf16_encoded_string(line) + '\n'
+            curr_entry[-1].append(_try_decode_utf16_encoded_string(line) + '\n')
 
     # Exiting loop. Add the last entry to result! 
     if curr_entry is not None:
+        curr_entry[-1] = ''.join(curr_entry[-1])
         result_dict[curr_entry[0]] = (curr_entry)
     return result_dict
  
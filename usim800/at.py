@@ -12,9 +12,13 @@ Key features:
 from __future__ import annotations
 
 import re
+import select
+import threading
 import time
-from dataclasses import dataclass
-from typing import Iterable, Optional
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple, Union
 
 import serial
 
@@ -24,6 +28,11 @@ from .locks import CombinedLock
 
 _CME_RE = re.compile(r"\+CME ERROR:\s*(\d+)")
 _CMS_RE = re.compile(r"\+CMS ERROR:\s*(\d+)")
+# "+TOKEN" of each command in a (possibly ;-chained) AT line
+_CMD_TOKEN_RE = re.compile(r"(?:^AT|;)\s*(\+[A-Z0-9]+)")
+# Registration URCs (AT+CREG=2 / AT+CGREG=2 stay on), kept out of the
+# responses of unrelated commands
+_REG_URC_PREFIXES = ("+CREG:", "+CGREG:")
 
 
 @dataclass
@@ -36,10 +45,49 @@ class ATResponse:
     """
     lines: list[str]
     raw: bytes
+    _blob: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _by_prefix: Optional[Dict[str, list[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def blob(self) -> str:
+        """
+        Lines joined with newlines, built once.
+        
+        For substring checks ("READY" in resp.blob) in one scan instead of
+        a Python loop over lines.
+        """
+        if self._blob is None:
+            self._blob = "\n".join(self.lines)
+        return self._blob
+
+    @property
+    def by_prefix(self) -> Dict[str, list[str]]:
+        """
+        Information lines indexed by their "+TOKEN" prefix, built once.
+        
+        "+CSQ: 20,0" is stored under "+CSQ", so parsers do a dict lookup
+        instead of a startswith() scan per line.
+        """
+        if self._by_prefix is None:
+            index: Dict[str, list[str]] = {}
+            for line in self.lines:
+                if line.startswith("+"):
+                    token, sep, _ = line.partition(":")
+                    if sep:
+                        index.setdefault(token, []).append(line)
+            self._by_prefix = index
+        return self._by_prefix
+
+    def first(self, token: str) -> Optional[str]:
+        """First line with the given "+TOKEN" prefix, or None."""
+        found = self.by_prefix.get(token)
+        return found[0] if found else None
 
     def text(self) -> str:
         """Get response as text (lines joined)."""
-        return "\n".join(self.lines)
+        return self.blob
 
 
 class ATChannel:
@@ -63,6 +111,7 @@ class ATChannel:
         logger=None,
     ):
         self.ser = serial.Serial(port=port, baudrate=baudrate, timeout=timeout)
+        self._timeout = timeout
         self.lock = CombinedLock(lockfile=lockfile)
         self.logger = logger
 
@@ -70,6 +119,28 @@ class ATChannel:
         self.sleep_wake_char = b"\r"
         self.sleep_wake_delay_s = 0.15  # >=100ms recommended
 
+        # URC prefixes someone is waiting for (wait_for_urc), and matching
+        # lines that arrived while another command held the channel
+        self._urc_watch: list[str] = []
+        self._urc_backlog: deque[str] = deque()
+        # Guards the two above (in-process state only: no need for the
+        # modem lock / flock just to look at them)
+        self._urc_lock = threading.Lock()
+
+        # Set after a raw read whose trailer (e.g. HTTPREAD's "\r\nOK\r\n")
+        # did not arrive in time; this channel's next command flushes it
+        self._needs_drain = False
+
+        # Readiness polling on the serial fd (POSIX), so URC waits can block
+        # without holding the modem lock; None -> fall back to blocking reads
+        self._poll = None
+        if hasattr(select, "poll"):
+            try:
+                self._poll = select.poll()
+                self._poll.register(self.ser.fileno(), select.POLLIN)
+            except (AttributeError, OSError, ValueError):
+                self._poll = None
+
     def close(self) -> None:
         """Close serial port."""
         self.ser.close()
@@ -82,6 +153,60 @@ class ATChannel:
         """Write raw bytes to serial port."""
         self.ser.write(data)
 
+    def _wait_readable(self, timeout_s: float) -> bool:
+        """
+        Wait until the serial port has data to read, or timeout.
+        
+        Returns:
+            True if data is (or may be) available, False on timeout
+        """
+        if self._poll is None:
+            # No pollable fd: check in_waiting at a short interval
+            end = time.monotonic() + max(timeout_s, 0.0)
+            while not self.ser.in_waiting:
+                if time.monotonic() >= end:
+                    return False
+                time.sleep(0.01)
+            return True
+        return bool(self._poll.poll(max(timeout_s, 0.0) * 1000))
+
+    def _drain_if_needed(self) -> None:
+        """Flush leftovers of a previous raw read before the next command."""
+        if self._needs_drain:
+            self.ser.reset_input_buffer()
+            self._needs_drain = False
+
+    @contextmanager
+    def _port_timeout(self, timeout_s: float):
+        """
+        Temporarily set the serial read timeout.
+        
+        For blocking reads of a known shape (prompt, header line, N body
+        bytes): pyserial then waits in the driver instead of us polling.
+        """
+        self.ser.timeout = timeout_s
+        try:
+            yield self.ser
+        finally:
+            self.ser.timeout = self._timeout
+
+    def _readline(self, deadline: float) -> bytes:
+        """
+        readline() that does not block past deadline.
+        
+        The port timeout is only narrowed for the last read before the
+        deadline (changing it reconfigures the port), then restored.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining >= self._timeout:
+            return self.ser.readline()
+        
+        self.ser.timeout = max(remaining, 0.01)
+        try:
+            return self.ser.readline()
+        finally:
+            self.ser.timeout = self._timeout
+
     def _read_until_terminal(
         self,
         timeout_s: float,
@@ -93,26 +218,46 @@ class ATChannel:
         
         Filters command echo if cmd_sent is provided.
         """
-        deadline = time.time() + timeout_s
+        deadline = time.monotonic() + timeout_s
         raw = bytearray()
         lines: list[str] = []
         echo_filtered = False
-
-        while time.time() < deadline:
-            chunk = self.ser.readline()
+        # Echo can be full command or without AT prefix
+        echo_variants = (
+            (cmd_sent, cmd_sent.replace("AT", "").strip()) if cmd_sent else ()
+        )
+        # The command's own information lines are never set aside as URCs
+        # (e.g. "+CGREG: 2,1" answering AT+CGREG? while a +CGREG: wait runs)
+        own_tokens = _CMD_TOKEN_RE.findall(cmd_sent) if cmd_sent else ()
+
+        while time.monotonic() < deadline:
+            chunk = self._readline(deadline)
             if not chunk:
                 continue
             
-            raw.extend(chunk)
             line = chunk.decode(errors="ignore").strip()
             
+            if line and line.partition(":")[0] not in own_tokens:
+                # URC awaited by wait_for_urc() that landed in this response
+                if self._urc_watch:
+                    with self._urc_lock:
+                        watched = line.startswith(tuple(self._urc_watch))
+                        if watched:
+                            self._urc_backlog.append(line)
+                    if watched:
+                        continue
+                # Registration URC nobody waits for (cell/LAC change)
+                if line.startswith(_REG_URC_PREFIXES):
+                    continue
+            
+            raw.extend(chunk)
+            
             if not line:
                 continue
             
             # Filter command echo (first non-empty line)
-            if cmd_sent and not echo_filtered:
-                # Echo can be full command or without AT prefix
-                if line == cmd_sent or line == cmd_sent.replace("AT", "").strip():
+            if echo_variants and not echo_filtered:
+                if line in echo_variants:
                     echo_filtered = True
                     continue
             
@@ -147,16 +292,32 @@ class ATChannel:
             )
             raise ATError(details)
 
+    def _pop_urc(self, prefix: Union[str, Tuple[str, ...]]) -> Optional[str]:
+        """Take the oldest backlogged URC line starting with prefix."""
+        with self._urc_lock:
+            for line in self._urc_backlog:
+                if line.startswith(prefix):
+                    self._urc_backlog.remove(line)
+                    return line
+        return None
+
     def wait_for_urc(
         self, 
-        prefix: str, 
+        prefix: Union[str, Tuple[str, ...]], 
         timeout_s: float,
     ) -> str:
         """
         Wait for specific URC (Unsolicited Result Code).
         
+        The modem lock is held only around each readline, and idle waiting
+        is done with poll() on the serial fd outside the lock, so other
+        threads and processes can run commands while a long URC wait (e.g.
+        a 60 s HTTPACTION) is pending. A matching URC read by one of those
+        commands is set aside and picked up here.
+        
         Args:
-            prefix: URC prefix to wait for (e.g., "+HTTPACTION:")
+            prefix: URC prefix to wait for (e.g., "+HTTPACTION:"), or a
+                    tuple of prefixes (first URC matching any is returned)
             timeout_s: Timeout in seconds
             
         Returns:
@@ -165,16 +326,29 @@ class ATChannel:
         Raises:
             ATTimeoutError: If URC not received within timeout
         """
-        deadline = time.time() + timeout_s
+        deadline = time.monotonic() + timeout_s
+        prefixes = (prefix,) if isinstance(prefix, str) else tuple(prefix)
+        with self._urc_lock:
+            self._urc_watch.extend(prefixes)
         
-        with self.lock.acquire():
-            while time.time() < deadline:
-                line = self.ser.readline()
-                if not line:
-                    time.sleep(0.01)
-                    continue
+        try:
+            while time.monotonic() < deadline:
+                decoded = self._pop_urc(prefix)
+                
+                # Idle wait outside the lock; the short cap re-checks the
+                # backlog in case another command consumed our URC
+                if decoded is None and self._wait_readable(
+                    min(deadline - time.monotonic(), 0.05)
+                ):
+                    with self.lock.acquire():
+                        decoded = self._pop_urc(prefix)
+                        # A command that ran while we waited for the lock
+                        # may have drained the port: never sit in a
+                        # blocking readline on an empty port under the lock
+                        if decoded is None and self.ser.in_waiting:
+                            line = self._readline(deadline)
+                            decoded = line.decode("utf-8", errors="ignore").strip()
                 
-                decoded = line.decode("utf-8", errors="ignore").strip()
                 if not decoded:
                     continue
                 
@@ -182,6 +356,18 @@ class ATChannel:
                     if self.logger:
                         self.logger.debug(f"URC << {decoded}")
                     return decoded
+        finally:
+            with self._urc_lock:
+                for p in prefixes:
+                    self._urc_watch.remove(p)
+                # Nobody waits for these any more: a stale line (e.g. a
+                # +HTTPACTION: after its waiter timed out) must not be
+                # returned to the next waiter
+                dropped = tuple(p for p in prefixes if p not in self._urc_watch)
+                if dropped and self._urc_backlog:
+                    self._urc_backlog = deque(
+                        l for l in self._urc_backlog if not l.startswith(dropped)
+                    )
         
         raise ATTimeoutError(f"Timeout waiting for URC {prefix!r}")
 
@@ -215,7 +401,39 @@ class ATChannel:
             ATError: On ERROR response (if expect_ok=True)
         """
         cmd = cmd.strip()
+        wire = (cmd + "\r\n").encode("ascii", errors="ignore")
+        return self._command(cmd, wire, timeout_s, expect_ok, wake_if_needed, retries)
+
+    def command_bytes(
+        self,
+        cmd: bytes,
+        timeout_s: float = 5.0,
+        expect_ok: bool = True,
+        wake_if_needed: bool = True,
+        retries: int = 0,
+    ) -> ATResponse:
+        """
+        Same as command(), for a command already built as ASCII bytes.
+        
+        Lets callers assemble commands from bytes templates
+        (b'AT+HTTPPARA="URL","' + url + b'"') without a str round-trip.
+        """
+        cmd = cmd.strip()
+        return self._command(
+            cmd.decode("ascii", errors="ignore"), cmd + b"\r\n",
+            timeout_s, expect_ok, wake_if_needed, retries,
+        )
 
+    def _command(
+        self,
+        cmd: str,
+        wire: bytes,
+        timeout_s: float,
+        expect_ok: bool,
+        wake_if_needed: bool,
+        retries: int,
+    ) -> ATResponse:
+        """Write 'wire' and read the response; 'cmd' is used for echo/errors."""
         for attempt in range(retries + 1):
             with self.lock.acquire():
                 if wake_if_needed:
@@ -223,7 +441,8 @@ class ATChannel:
                     self.write_raw(self.sleep_wake_char)
                     time.sleep(self.sleep_wake_delay_s)
 
-                wire = (cmd + "\r\n").encode("ascii", errors="ignore")
+                self._drain_if_needed()
+
                 if self.logger:
                     self.logger.debug("AT >> %s", cmd)
                 
@@ -251,19 +470,170 @@ class ATChannel:
 
         raise ATTimeoutError(f"Timeout sending {cmd!r}")
 
+    def command_batch(
+        self,
+        cmds: Iterable[Union[str, bytes]],
+        timeout_s: float = 5.0,
+        expect_ok: bool = True,
+        wake_if_needed: bool = True,
+    ) -> list[ATResponse]:
+        """
+        Send independent AT commands in one write, one response per command.
+
+        Only for commands that do not depend on each other's result
+        (parameter writes like SAPBR=3 / HTTPPARA).
+
+        Args:
+            cmds: AT commands (without \\r\\n), str or prebuilt ASCII bytes
+            timeout_s: Response timeout per command
+            expect_ok: If True, raise on the first ERROR response
+            wake_if_needed: Send wake char first (for CSCLK=2)
+
+        Returns:
+            ATResponse per command, in order
+
+        Raises:
+            ATTimeoutError: On timeout
+            ATError: On ERROR response (if expect_ok=True), raised only after
+                     all responses were read so the channel stays in sync
+        """
+        names: list[str] = []
+        wire_cmds: list[bytes] = []
+        for c in cmds:
+            c = c.strip()
+            if isinstance(c, bytes):
+                wire_cmds.append(c)
+                names.append(c.decode("ascii", errors="ignore"))
+            else:
+                wire_cmds.append(c.encode("ascii", errors="ignore"))
+                names.append(c)
+        cmds = names
+
+        with self.lock.acquire():
+            if wake_if_needed:
+                self.write_raw(self.sleep_wake_char)
+                time.sleep(self.sleep_wake_delay_s)
+
+            self._drain_if_needed()
+
+            wire = b"".join(c + b"\r\n" for c in wire_cmds)
+            if self.logger:
+                self.logger.debug("AT >> %s", " | ".join(cmds))
+
+            self.write_raw(wire)
+
+            responses = [
+                self._read_until_terminal(timeout_s=timeout_s, cmd_sent=cmd)
+                for cmd in cmds
+            ]
+
+        if self.logger:
+            for resp in responses:
+                self.logger.debug("AT << %s", resp.text())
+
+        if expect_ok:
+            for cmd, resp in zip(cmds, responses):
+                self._raise_if_error(cmd, resp)
+
+        return responses
+
+    def batch(
+        self,
+        cmds: Iterable[str],
+        timeout_s: float = 5.0,
+    ) -> Dict[str, ATResponse]:
+        """
+        Send independent queries in one write and return responses by command.
+        
+        Same wire behaviour as command_batch(), but does not raise on ERROR:
+        each command's response is returned for the caller to interpret.
+        Duplicate commands keep the last response.
+        
+        Args:
+            cmds: AT commands (without \\r\\n)
+            timeout_s: Response timeout per command
+        
+        Returns:
+            Mapping of command -> ATResponse
+        
+        Raises:
+            ATTimeoutError: On timeout
+        """
+        cmds = [c.strip() for c in cmds]
+        responses = self.command_batch(cmds, timeout_s=timeout_s, expect_ok=False)
+        return dict(zip(cmds, responses))
+
     def flush_input(self) -> None:
         """Discard anything currently in the RX buffer."""
         with self.lock.acquire():
             self.ser.reset_input_buffer()
 
-    def sync(self) -> None:
+    def set_baudrate(self, baudrate: int) -> bool:
+        """
+        Switch modem and serial port to a new baudrate (AT+IPR).
+        
+        The setting is not stored (no AT&W), so the module comes back at
+        its power-on rate after a reset.
+        
+        Args:
+            baudrate: Target rate (e.g. 115200; SIM800 supports up to 460800)
+            
+        Returns:
+            True if the modem answers at the new rate, False if it did not
+            and the port was switched back to the previous rate
+        """
+        old = self.ser.baudrate
+        if baudrate == old:
+            return True
+        
+        with self.lock.acquire():
+            self.command(f"AT+IPR={baudrate}", timeout_s=2)
+            self.ser.baudrate = baudrate
+            time.sleep(0.1)
+            self.ser.reset_input_buffer()
+            
+            try:
+                self.command("AT", timeout_s=2, retries=2)
+                return True
+            except ATTimeoutError:
+                if self.logger:
+                    self.logger.warning(
+                        f"No answer at {baudrate} baud, staying at {old}"
+                    )
+                self.ser.baudrate = old
+                self.ser.reset_input_buffer()
+                self.command("AT", timeout_s=2, retries=2)
+                return False
+
+    def sync(self, baudrate: Optional[int] = None) -> None:
         """
         Synchronize with modem.
         
         - Test with AT
         - Disable echo (ATE0)
         - Enable verbose errors (AT+CMEE=2)
+        - Optionally switch to a faster baudrate (AT+IPR)
+        
+        Args:
+            baudrate: If set, switch to this rate after the initial AT
+                      (e.g. 115200 when the module powers up at 9600)
         """
-        self.command("AT", timeout_s=2, retries=2)
-        self.command("ATE0", timeout_s=2)
-        self.command("AT+CMEE=2", timeout_s=2)
+        try:
+            self.command("AT", timeout_s=2, retries=2)
+        except ATTimeoutError:
+            old = self.ser.baudrate
+            if not baudrate or baudrate == old:
+                raise
+            # AT+IPR from an earlier run disables autobaud until the module
+            # resets: it may still be listening at the target rate
+            with self.lock.acquire():
+                self.ser.baudrate = baudrate
+                self.ser.reset_input_buffer()
+                try:
+                    self.command("AT", timeout_s=2, retries=1)
+                except ATTimeoutError:
+                    self.ser.baudrate = old
+                    raise
+        if baudrate:
+            self.set_baudrate(baudrate)
+        self.command_batch(["ATE0", "AT+CMEE=2"], timeout_s=2)
@@ -11,12 +11,22 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .at import ATChannel
-from .exceptions import GPRSError
+from .exceptions import ATError, ATTimeoutError, GPRSError, SIM800Error
+from .network import Network
+
+
+# +SAPBR: <cid>,<status>[,"<ip>"]
+_SAPBR_RE = re.compile(r'\+SAPBR:\s*(\d+),(\d+)(?:,"([^"]*)")?')
+
+# URC (CGREG=2): +CGREG: <stat>[,"<lac>","<ci>"]
+_CGREG_URC_RE = re.compile(r"\+CGREG:\s*(\d+)")
 
 
 @dataclass
 class BearerStatus:
     """Bearer connection status."""
+    __slots__ = ("cid", "status", "ip")
+    
     cid: int              # Context ID
     status: int           # 0=connecting, 1=connected, 2=closing, 3=closed
     ip: Optional[str]     # Assigned IP address (if connected)
@@ -56,23 +66,72 @@ class GPRS:
         Raises:
             GPRSError: If cannot attach within timeout
         """
-        deadline = time.time() + timeout_s
+        deadline = time.monotonic() + timeout_s
+        
+        try:
+            self.at.command("AT+CGATT=1", timeout_s=5, retries=1)
+        except (ATError, ATTimeoutError):
+            pass  # Attach may still complete in the background
+        
+        if self._attached():
+            return
         
-        while time.time() < deadline:
-            try:
-                self.at.command("AT+CGATT=1", timeout_s=5, retries=1)
+        # Not attached yet: wait for the registration URC instead of polling
+        # (CGREG URCs stay on; ATChannel keeps them out of unrelated
+        # command responses)
+        try:
+            self.at.command("AT+CGREG=2", timeout_s=3)
+            
+            # A "+CGREG: 1" sent before the wait below starts lands in a
+            # command response and is gone: re-check once before blocking
+            if self._gprs_registered():
+                return
+            
+            while time.monotonic() < deadline:
+                urc = self.at.wait_for_urc(
+                    "+CGREG:", timeout_s=max(deadline - time.monotonic(), 0.1)
+                )
+                match = _CGREG_URC_RE.match(urc)
+                stat = int(match.group(1)) if match else None
                 
-                # Verify attachment
-                resp = self.at.command("AT+CGATT?", timeout_s=3)
-                if any("+CGATT: 1" in line for line in resp.lines):
+                if stat in (1, 5):  # 1=home, 5=roaming
                     return
-            except:
-                pass
-            
-            time.sleep(1.0)
+                if stat == 3:
+                    raise GPRSError("GPRS registration denied (+CGREG: 3)")
+        except (ATError, ATTimeoutError):
+            pass
+        
+        # No URC: one final check
+        if self._attached():
+            return
         
         raise GPRSError("Could not attach to GPRS (AT+CGATT=1)")
 
+    def _attached(self) -> bool:
+        """Single AT+CGATT? check."""
+        try:
+            resp = self.at.command("AT+CGATT?", timeout_s=3)
+        except (ATError, ATTimeoutError):
+            return False
+        return "+CGATT: 1" in resp.blob
+
+    def _gprs_registered(self) -> bool:
+        """Single AT+CGREG? check (also sees a URC inside the response)."""
+        try:
+            resp = self.at.command("AT+CGREG?", timeout_s=3)
+        except (ATError, ATTimeoutError):
+            return False
+        return any(
+            Network._parse_reg_stat(line) in (1, 5)  # 1=home, 5=roaming
+            for line in resp.by_prefix.get("+CGREG", ())
+        )
+
+    def _sapbr_param(self, tag: bytes, value: str) -> bytes:
+        """Build AT+SAPBR=3,<cid>,"<tag>","<value>" as bytes."""
+        return b'AT+SAPBR=3,%d,"%s","%s"' % (
+            self.cid, tag, value.encode("ascii", errors="ignore")
+        )
+
     def open(self) -> BearerStatus:
         """
         Configure and open bearer connection.
@@ -83,22 +142,20 @@ class GPRS:
         Raises:
             GPRSError: If bearer cannot be opened
         """
-        # Configure bearer
-        self.at.command(f'AT+SAPBR=3,{self.cid},"Contype","GPRS"', timeout_s=5)
-        self.at.command(f'AT+SAPBR=3,{self.cid},"APN","{self.apn}"', timeout_s=5)
+        # Configure bearer: independent parameter writes, one batched write
+        params = [
+            self._sapbr_param(b"Contype", "GPRS"),
+            self._sapbr_param(b"APN", self.apn),
+        ]
         
         # Add authentication if provided
         if self.username:
-            self.at.command(
-                f'AT+SAPBR=3,{self.cid},"USER","{self.username}"', 
-                timeout_s=5
-            )
+            params.append(self._sapbr_param(b"USER", self.username))
         
         if self.password:
-            self.at.command(
-                f'AT+SAPBR=3,{self.cid},"PWD","{self.password}"', 
-                timeout_s=5
-            )
+            params.append(self._sapbr_param(b"PWD", self.password))
+        
+        self.at.command_batch(params, timeout_s=5)
         
         # Open bearer (this can take 30-90 seconds on some networks)
         self.at.command(f"AT+SAPBR=1,{self.cid}", timeout_s=90, retries=1)
@@ -119,22 +176,14 @@ class GPRS:
         
         # Response: +SAPBR: <cid>,<status>,"<ip>"
         # or: +SAPBR: <cid>,<status>
-        for line in resp.lines:
-            if line.startswith("+SAPBR:"):
-                # Try with IP
-                match = re.search(r'\+SAPBR:\s*(\d+),(\d+),\"([^\"]*)\"', line)
-                if match:
-                    cid = int(match.group(1))
-                    status = int(match.group(2))
-                    ip = match.group(3) or None
-                    return BearerStatus(cid=cid, status=status, ip=ip)
-                
-                # Try without IP
-                match = re.search(r"\+SAPBR:\s*(\d+),(\d+)", line)
-                if match:
-                    cid = int(match.group(1))
-                    status = int(match.group(2))
-                    return BearerStatus(cid=cid, status=status, ip=None)
+        for line in resp.by_prefix.get("+SAPBR", ()):
+            match = _SAPBR_RE.match(line)
+            if match:
+                return BearerStatus(
+                    cid=int(match.group(1)),
+                    status=int(match.group(2)),
+                    ip=match.group(3) or None,
+                )
         
         raise GPRSError("Could not parse SAPBR status")
 
@@ -146,5 +195,5 @@ class GPRS:
         """
         try:
             self.at.command(f"AT+SAPBR=0,{self.cid}", timeout_s=20, retries=0)
-        except:
+        except (SIM800Error, OSError):
             pass  # Best effort
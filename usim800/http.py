@@ -17,12 +17,33 @@ from typing import Dict, Optional, Union
 from functools import wraps
 
 from .at import ATChannel
-from .exceptions import HTTPError
+from .exceptions import ATTimeoutError, HTTPError, SIM800Error
+
+
+# +HTTPACTION: <method>,<status>,<length>
+_HTTPACTION_RE = re.compile(r"\+HTTPACTION:\s*\d+,(\d+),(\d+)")
+
+# AT+HTTPPARA command templates (url / content type go in between)
+_URL_PREFIX = b'AT+HTTPPARA="URL","'
+_CONTENT_PREFIX = b'AT+HTTPPARA="CONTENT","'
+_USERDATA_PREFIX = b'AT+HTTPPARA="USERDATA","'
+_PARA_SUFFIX = b'"'
+
+# SIM800 HTTP stack error codes (600+)
+_HTTP_ERR_MSGS = {
+    601: "Network error (601) - bearer connection lost or network unreachable",
+    602: "No memory (602) - insufficient memory for operation",
+    603: "DNS error (603) - cannot resolve hostname",
+    604: "Stack busy (604) - HTTP stack is occupied",
+    606: "Timeout (606) - HTTP request timeout",
+}
 
 
 @dataclass
 class HTTPResponse:
     """HTTP response from SIM800."""
+    __slots__ = ("status_code", "data")
+
     status_code: int
     data: bytes
 
@@ -42,23 +63,29 @@ def retry_on_http_error(max_retries=3, retry_codes=(604,), delay=5.0):
         delay: Delay between retries in seconds
     """
     def decorator(func):
+        # Settings are bound as keyword-only defaults so the wrapper reads
+        # them as fast locals instead of closure cells on every call.
         @wraps(func)
-        def wrapper(self, *args, **kwargs):
+        def wrapper(
+            self, *args,
+            _max_retries=max_retries, _retry_codes=retry_codes, _delay=delay,
+            **kwargs
+        ):
             last_error = None
-            for attempt in range(max_retries):
+            for attempt in range(_max_retries):
                 try:
                     return func(self, *args, **kwargs)
                 except HTTPError as e:
                     last_error = e
-                    if e.status_code not in retry_codes:
+                    if e.status_code not in _retry_codes:
                         raise
-                    if attempt < max_retries - 1:
+                    if attempt < _max_retries - 1:
                         if self.at.logger:
                             self.at.logger.warning(
                                 f"HTTP error {e.status_code}, "
-                                f"retry {attempt + 1}/{max_retries} after {delay}s"
+                                f"retry {attempt + 1}/{_max_retries} after {_delay}s"
                             )
-                        time.sleep(delay)
+                        time.sleep(_delay)
                     else:
                         raise
             raise last_error
@@ -80,6 +107,9 @@ class HTTP:
     def __init__(self, at: ATChannel, cid: int = 1):
         self.at = at
         self.cid = cid
+        # USERDATA persists across requests until HTTPINIT/HTTPTERM, so
+        # remember whether headers were sent and clear them when not wanted
+        self._userdata_set = False
 
     def term(self) -> None:
         """
@@ -87,9 +117,10 @@ class HTTP:
         
         Best-effort operation (does not raise on failure).
         """
+        self._userdata_set = False
         try:
             self.at.command("AT+HTTPTERM", timeout_s=5, expect_ok=False)
-        except:
+        except (SIM800Error, OSError):
             pass
 
     def init(self) -> None:
@@ -98,9 +129,12 @@ class HTTP:
         
         Terminates any existing session first, then initializes new one.
         """
-        self.term()  # Best-effort cleanup
-        self.at.command("AT+HTTPINIT", timeout_s=5)
-        self.at.command(f'AT+HTTPPARA="CID",{self.cid}', timeout_s=5)
+        # TERM (best-effort cleanup) + INIT + CID in one write / round-trip
+        cmds = ["AT+HTTPTERM", "AT+HTTPINIT", f'AT+HTTPPARA="CID",{self.cid}']
+        self._userdata_set = False
+        responses = self.at.command_batch(cmds, timeout_s=5, expect_ok=False)
+        for cmd, resp in zip(cmds[1:], responses[1:]):
+            self.at._raise_if_error(cmd, resp)
 
     def set_headers(self, headers: Dict[str, str]) -> None:
         """
@@ -111,41 +145,64 @@ class HTTP:
         if not headers:
             return
         
-        header_blob = "\\r\\n".join([f"{k}: {v}" for k, v in headers.items()])
-        self.at.command(f'AT+HTTPPARA="USERDATA","{header_blob}"', timeout_s=5)
+        self.at.command_bytes(self._userdata_cmd(headers), timeout_s=5)
+        self._userdata_set = True
+
+    @staticmethod
+    def _userdata_cmd(headers: Dict[str, str]) -> bytes:
+        """Build the HTTPPARA USERDATA command for custom headers."""
+        # Single pass into one buffer; the modem expects a literal "\\r\\n"
+        # between headers
+        buf = bytearray(_USERDATA_PREFIX)
+        first = True
+        for k, v in headers.items():
+            if not first:
+                buf += b"\\r\\n"
+            buf += str(k).encode("ascii", errors="ignore")
+            buf += b": "
+            buf += str(v).encode("ascii", errors="ignore")
+            first = False
+        buf += _PARA_SUFFIX
+        return bytes(buf)
+
+    def set_params(
+        self,
+        url: str,
+        content_type: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout_s: float = 5.0,
+    ) -> None:
+        """
+        Set URL, CONTENT and USERDATA parameters in one batched write.
+        
+        Args:
+            url: Full URL
+            content_type: CONTENT parameter (skipped if None)
+            headers: Optional custom headers (USERDATA)
+            timeout_s: Response timeout per parameter
+        """
+        cmds = [_URL_PREFIX + url.encode("ascii", errors="ignore") + _PARA_SUFFIX]
+        if content_type is not None:
+            cmds.append(
+                _CONTENT_PREFIX + content_type.encode("ascii", errors="ignore") + _PARA_SUFFIX
+            )
+        if headers:
+            cmds.append(self._userdata_cmd(headers))
+        elif self._userdata_set:
+            # Headers of an earlier request must not go to this URL
+            cmds.append(_USERDATA_PREFIX + _PARA_SUFFIX)
+        
+        if headers:
+            self._userdata_set = True  # even if the batch fails half-way
+        self.at.command_batch(cmds, timeout_s=timeout_s)
+        self._userdata_set = bool(headers)
 
     def _handle_http_error(self, status: int):
         """Handle HTTP error codes 600+."""
-        if status == 601:
-            raise HTTPError(
-                "Network error (601) - bearer connection lost or network unreachable",
-                status_code=status
-            )
-        elif status == 602:
-            raise HTTPError(
-                "No memory (602) - insufficient memory for operation",
-                status_code=status
-            )
-        elif status == 603:
-            raise HTTPError(
-                "DNS error (603) - cannot resolve hostname",
-                status_code=status
-            )
-        elif status == 604:
-            raise HTTPError(
-                "Stack busy (604) - HTTP stack is occupied",
-                status_code=status
-            )
-        elif status == 606:
-            raise HTTPError(
-                "Timeout (606) - HTTP request timeout",
-                status_code=status
-            )
-        else:
-            raise HTTPError(
-                f"HTTP stack error ({status})",
-                status_code=status
-            )
+        raise HTTPError(
+            _HTTP_ERR_MSGS.get(status, f"HTTP stack error ({status})"),
+            status_code=status
+        )
 
     def _read_http_body(self, expected_length: int) -> bytes:
         """
@@ -173,50 +230,55 @@ class HTTP:
             self.at.write_raw(self.at.sleep_wake_char)
             time.sleep(self.at.sleep_wake_delay_s)
 
+            # Drop stale bytes (late URCs, wake echo) so the marker search
+            # below only sees the HTTPREAD answer
+            self.at.ser.reset_input_buffer()
+            self.at._needs_drain = False
+
             # Send HTTPREAD directly (avoid at.command(), we want full control)
             self.at.write_raw(b"AT+HTTPREAD\r\n")
 
             # Response format: +HTTPREAD: <len>\r\n<DATA>\r\nOK
-            raw = bytearray()
-            deadline = time.time() + 30.0
-
-            # Read until we see the marker
-            while time.time() < deadline and marker not in raw:
-                chunk = self.at.ser.read(self.at.ser.in_waiting or 1)
-                if chunk:
-                    raw.extend(chunk)
-                else:
-                    time.sleep(0.01)
-
-            if marker not in raw:
-                raise HTTPError("Did not receive +HTTPREAD response")
-
-            # Find end of header line
-            marker_pos = raw.find(marker)
-            first_crlf = raw.find(crlf, marker_pos)
-            if first_crlf == -1:
-                raise HTTPError("Malformed +HTTPREAD response")
-
-            body_start = first_crlf + len(crlf)
-
-            # Read until we have the full body
-            while len(raw) < body_start + expected_length and time.time() < deadline:
-                remaining = body_start + expected_length - len(raw)
-                chunk = self.at.ser.read(min(remaining, 1024))
-                if chunk:
-                    raw.extend(chunk)
-                else:
-                    time.sleep(0.01)
-
-            if len(raw) < body_start + expected_length:
+            # Blocking reads: pyserial waits in the driver for the header line
+            # and then for exactly expected_length body bytes.
+            deadline = time.monotonic() + 30.0
+
+            with self.at._port_timeout(30.0) as ser:
+                # Skip echo / blank lines up to the header line
+                while True:
+                    line = ser.read_until(crlf)
+                    if marker in line:
+                        break
+                    if not line.endswith(crlf) or time.monotonic() >= deadline:
+                        raise HTTPError("Did not receive +HTTPREAD response")
+
+                # The header states how many bytes follow; read exactly that
+                # many so the stream stays in sync even if it differs from
+                # the HTTPACTION length.
+                try:
+                    announced = int(line[line.index(marker) + len(marker):])
+                except ValueError:
+                    raise HTTPError(f"Malformed +HTTPREAD header: {line!r}")
+
+                # One read(n) straight into the returned bytes object: no
+                # staging buffer and no slicing. (pyserial's readinto() is
+                # read() plus a copy, so a preallocated buffer would not help.)
+                ser.timeout = max(deadline - time.monotonic(), 0.1)
+                body = ser.read(announced)
+
+            if len(body) < expected_length:
                 raise HTTPError(
-                    f"HTTPREAD truncated: got {max(0, len(raw) - body_start)} of {expected_length} bytes"
+                    f"HTTPREAD truncated: got {len(body)} of {expected_length} bytes"
                 )
 
-            body = bytes(raw[body_start:body_start + expected_length])
-
-            # Drain trailing CRLF + OK/ERROR best-effort (do not block)
-            _ = self.at.ser.read(self.at.ser.in_waiting or 0)
+            # Consume the trailing CRLF + OK/ERROR while still holding the
+            # lock, so the next owner (possibly another process) does not
+            # read it as its own reply. Only if it does not show up is it
+            # left to this channel's pre-command flush.
+            try:
+                self.at._read_until_terminal(timeout_s=1)
+            except ATTimeoutError:
+                self.at._needs_drain = True
 
             return body
 
@@ -244,11 +306,11 @@ class HTTP:
                 prefix="+HTTPACTION:",
                 timeout_s=read_timeout_s
             )
-        except Exception:
+        except (SIM800Error, OSError):
             raise HTTPError("Timeout waiting for +HTTPACTION")
         
         # Parse: +HTTPACTION: <method>,<status>,<length>
-        match = re.search(r"\+HTTPACTION:\s*\d+,(\d+),(\d+)", action_line)
+        match = _HTTPACTION_RE.search(action_line)
         if not match:
             raise HTTPError(f"Could not parse +HTTPACTION: {action_line}")
         
@@ -288,10 +350,7 @@ class HTTP:
         Returns:
             HTTPResponse
         """
-        self.at.command(f'AT+HTTPPARA="URL","{url}"', timeout_s=5)
-        
-        if headers:
-            self.set_headers(headers)
+        self.set_params(url, headers=headers)
         
         return self._action_and_read(method=0, read_timeout_s=timeout_s)
 
@@ -312,71 +371,41 @@ class HTTP:
         Returns:
             HTTPResponse (empty body)
         """
-        self.at.command(f'AT+HTTPPARA="URL","{url}"', timeout_s=5)
-        
-        if headers:
-            self.set_headers(headers)
+        self.set_params(url, headers=headers)
         
         return self._action_and_read(method=2, read_timeout_s=timeout_s)
 
-    @retry_on_http_error(max_retries=3, retry_codes=(604,), delay=5.0)
-    def post(
-        self,
-        url: str,
-        data: Union[str, bytes],
-        content_type: str = "application/json",
-        headers: Optional[Dict[str, str]] = None,
-        httpdata_timeout_ms: int = 10000,
-        timeout_s: float = 120.0
-    ) -> HTTPResponse:
+    def _upload(self, body: bytes, httpdata_timeout_ms: int = 10000) -> None:
         """
-        Execute HTTP POST request.
-        
+        Upload request body via AT+HTTPDATA.
+
+        Waits for the DOWNLOAD prompt, sends the bytes and waits for OK.
+
         Args:
-            url: Full URL
-            data: Request body (str or bytes)
-            content_type: Content-Type header
-            headers: Optional custom headers
+            body: Request body
             httpdata_timeout_ms: HTTPDATA timeout (milliseconds)
-            timeout_s: Request timeout
-            
-        Returns:
-            HTTPResponse
-        """
-        if isinstance(data, str):
-            body = data.encode("utf-8")
-        else:
-            body = data
-
-        self.at.command(f'AT+HTTPPARA="URL","{url}"', timeout_s=5)
-        self.at.command(f'AT+HTTPPARA="CONTENT","{content_type}"', timeout_s=5)
-        
-        if headers:
-            self.set_headers(headers)
 
+        Raises:
+            HTTPError: If the modem does not prompt for data
+        """
         # HTTPDATA with DOWNLOAD prompt detection (atomic operation)
         with self.at.lock.acquire():
             if self.at.logger:
                 self.at.logger.debug(f"Sending HTTPDATA command, size={len(body)}")
             
+            self.at._drain_if_needed()
+
             # Send HTTPDATA command
             cmd = f"AT+HTTPDATA={len(body)},{httpdata_timeout_ms}\r\n"
             self.at.write_raw(cmd.encode("ascii"))
             
-            # Wait for DOWNLOAD prompt
-            deadline = time.time() + (httpdata_timeout_ms / 1000.0 + 5.0)
-            got_download = False
+            # Wait for DOWNLOAD prompt (blocking read, no polling)
+            prompt_timeout_s = httpdata_timeout_ms / 1000.0 + 5.0
+            with self.at._port_timeout(prompt_timeout_s) as ser:
+                got_download = ser.read_until(b"DOWNLOAD").endswith(b"DOWNLOAD")
             
-            while time.time() < deadline:
-                chunk = self.at.ser.read(self.at.ser.in_waiting or 1)
-                if chunk:
-                    if b"DOWNLOAD" in chunk:
-                        got_download = True
-                        if self.at.logger:
-                            self.at.logger.debug("Received DOWNLOAD prompt")
-                        break
-                else:
-                    time.sleep(0.05)
+            if got_download and self.at.logger:
+                self.at.logger.debug("Received DOWNLOAD prompt")
             
             if not got_download:
                 raise HTTPError("Did not receive DOWNLOAD prompt from modem")
@@ -393,6 +422,39 @@ class HTTP:
             # Wait for OK from HTTPDATA
             resp = self.at._read_until_terminal(timeout_s=10)
             self.at._raise_if_error("AT+HTTPDATA", resp)
+
+    @retry_on_http_error(max_retries=3, retry_codes=(604,), delay=5.0)
+    def post(
+        self,
+        url: str,
+        data: Union[str, bytes],
+        content_type: str = "application/json",
+        headers: Optional[Dict[str, str]] = None,
+        httpdata_timeout_ms: int = 10000,
+        timeout_s: float = 120.0
+    ) -> HTTPResponse:
+        """
+        Execute HTTP POST request.
         
+        Args:
+            url: Full URL
+            data: Request body (str or bytes)
+            content_type: Content-Type header
+            headers: Optional custom headers
+            httpdata_timeout_ms: HTTPDATA timeout (milliseconds)
+            timeout_s: Request timeout
+            
+        Returns:
+            HTTPResponse
+        """
+        if isinstance(data, str):
+            body = data.encode("utf-8")
+        else:
+            body = data
+
+        self.set_params(url, content_type=content_type, headers=headers)
+
+        self._upload(body, httpdata_timeout_ms=httpdata_timeout_ms)
+
         # Now execute POST action
         return self._action_and_read(method=1, read_timeout_s=timeout_s)
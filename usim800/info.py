@@ -12,11 +12,52 @@ Provides access to device and network information:
 from __future__ import annotations
 
 import re
-from typing import Optional, Tuple
+import time
+from functools import wraps
+from typing import Any, Dict, Optional, Tuple
 
-from .at import ATChannel
-from .network import Network
-from .exceptions import LocationError
+from .at import ATChannel, ATResponse
+from .network import Network, SignalQuality
+from .exceptions import LocationError, SIM800Error
+
+
+# +CBC: <bcs>,<bcl>,<voltage>
+_CBC_RE = re.compile(r"\+CBC:\s*(\d+),(\d+),(\d+)")
+
+# +CIPGSMLOC: <loccode>[,<longitude>,<latitude>,<date>,<time>]
+_CIPGSMLOC_RE = re.compile(r"\+CIPGSMLOC:\s*(\d+)(?:,([-\d.]+),([-\d.]+))?")
+
+# TTL for values that change slowly (signal, operator, battery)
+_VOLATILE_TTL_S = 2.0
+
+# cache key -> TTL in seconds (None = forever), filled in by _cached
+_TTLS: Dict[str, Optional[float]] = {}
+
+
+def _cached(key: str, ttl_s: Optional[float] = None):
+    """
+    Cache a getter's result in ``self._cache``.
+    
+    Args:
+        key: Cache key
+        ttl_s: Time to live in seconds (None = forever, for immutable values)
+    
+    None results (errors) are not cached, so the next call retries.
+    """
+    _TTLS[key] = ttl_s
+    
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self):
+            now = time.monotonic()
+            if self._is_fresh(key, now):
+                return self._cache[key][1]
+            value = func(self)
+            if value is not None:
+                self._cache[key] = (now, value)
+            return value
+        return wrapper
+    return decorator
 
 
 class Info:
@@ -30,6 +71,20 @@ class Info:
         self.at = at
         self.network = network
         self._apn: Optional[str] = None
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+
+    def _is_fresh(self, key: str, now: float) -> bool:
+        """Whether ``key`` is cached and within its TTL at ``now``."""
+        hit = self._cache.get(key)
+        if hit is None:
+            return False
+        ttl_s = _TTLS.get(key)
+        return ttl_s is None or now - hit[0] < ttl_s
+
+    def clear_cache(self) -> None:
+        """Drop cached values (e.g. after a SIM swap or modem reset)."""
+        self._cache.clear()
+        self.network.invalidate_identity()
 
     @property
     def APN(self) -> Optional[str]:
@@ -41,6 +96,7 @@ class Info:
         """Set APN for location services."""
         self._apn = val
 
+    @_cached("imei")
     def getIMEI(self) -> Optional[str]:
         """
         Get module IMEI number.
@@ -50,11 +106,12 @@ class Info:
         """
         try:
             return self.network.get_imei()
-        except Exception as e:
+        except (SIM800Error, OSError, ValueError) as e:
             if self.at.logger:
                 self.at.logger.error(f"getIMEI failed: {e}")
             return None
 
+    @_cached("iccid")
     def getICCID(self) -> Optional[str]:
         """
         Get SIM ICCID number.
@@ -64,11 +121,12 @@ class Info:
         """
         try:
             return self.network.get_iccid()
-        except Exception as e:
+        except (SIM800Error, OSError, ValueError) as e:
             if self.at.logger:
                 self.at.logger.error(f"getICCID failed: {e}")
             return None
 
+    @_cached("module_version")
     def getModuleVersion(self) -> Optional[str]:
         """
         Get module firmware version.
@@ -79,17 +137,9 @@ class Info:
         try:
             cmd = "AT+CGMR"
             resp = self.at.command(cmd, timeout_s=3, expect_ok=True)
+            return self._parse_cgmr(resp)
             
-            for line in resp.lines:
-                if "Revision" in line:
-                    # Example: Revision:1418B05SIM800L24
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        return parts[1].strip()
-            
-            return None
-            
-        except Exception as e:
+        except (SIM800Error, OSError, ValueError) as e:
             if self.at.logger:
                 self.at.logger.error(f"getModuleVersion failed: {e}")
             return None
@@ -107,34 +157,38 @@ class Info:
             
             cmd = "AT+CPIN?"
             resp = self.at.command(cmd, timeout_s=3, expect_ok=True)
+            return self._parse_cpin(resp)
             
-            for line in resp.lines:
-                if line.startswith("+CPIN:"):
-                    status = line.split(":")[1].strip()
-                    return status
-            
-            return None
-            
-        except Exception as e:
+        except (SIM800Error, OSError, ValueError) as e:
             if self.at.logger:
                 self.at.logger.error(f"checkSim failed: {e}")
             return None
 
-    def getRSSI(self) -> Optional[int]:
+    @_cached("signal", ttl_s=_VOLATILE_TTL_S)
+    def _signal(self) -> Optional[SignalQuality]:
         """
-        Get signal strength (RSSI).
+        Shared AT+CSQ snapshot for getRSSI() and getSignalBars().
         
         Returns:
-            RSSI value (0-31, 99=unknown) or None on error
+            SignalQuality or None on error
         """
         try:
-            sig = self.network.get_signal()
-            return sig.rssi
-        except Exception as e:
+            return self.network.get_signal()
+        except (SIM800Error, OSError, ValueError) as e:
             if self.at.logger:
-                self.at.logger.error(f"getRSSI failed: {e}")
+                self.at.logger.error(f"get_signal failed: {e}")
             return None
 
+    def getRSSI(self) -> Optional[int]:
+        """
+        Get signal strength (RSSI).
+        
+        Returns:
+            RSSI value (0-31, 99=unknown) or None on error
+        """
+        sig = self._signal()
+        return sig.rssi if sig is not None else None
+
     def getSignalBars(self) -> Optional[int]:
         """
         Get signal strength as "bars" (0-5).
@@ -142,14 +196,10 @@ class Info:
         Returns:
             Signal bars (0-5) or None on error
         """
-        try:
-            sig = self.network.get_signal()
-            return sig.bars()
-        except Exception as e:
-            if self.at.logger:
-                self.at.logger.error(f"getSignalBars failed: {e}")
-            return None
+        sig = self._signal()
+        return sig.bars() if sig is not None else None
 
+    @_cached("operator", ttl_s=_VOLATILE_TTL_S)
     def getOperator(self) -> Optional[str]:
         """
         Get network operator name.
@@ -159,11 +209,12 @@ class Info:
         """
         try:
             return self.network.get_operator()
-        except Exception as e:
+        except (SIM800Error, OSError, ValueError) as e:
             if self.at.logger:
                 self.at.logger.error(f"getOperator failed: {e}")
             return None
 
+    @_cached("battery", ttl_s=_VOLATILE_TTL_S)
     def getCBC(self) -> Optional[Tuple[int, float]]:
         """
         Get battery status.
@@ -174,27 +225,44 @@ class Info:
         try:
             cmd = "AT+CBC"
             resp = self.at.command(cmd, timeout_s=3, expect_ok=True)
+            return self._parse_cbc(resp)
             
-            for line in resp.lines:
-                if line.startswith("+CBC:"):
-                    # +CBC: <bcs>,<bcl>,<voltage>
-                    # bcs: battery charge status (0=not charging, 1=charging, 2=charging done)
-                    # bcl: battery charge level (1-100%)
-                    # voltage: battery voltage in mV
-                    parts = line.split(":")[1].split(",")
-                    if len(parts) >= 3:
-                        battery_percent = int(parts[1].strip())
-                        voltage_mv = int(parts[2].strip())
-                        voltage_v = voltage_mv / 1000.0
-                        return (battery_percent, voltage_v)
-            
-            return None
-            
-        except Exception as e:
+        except (SIM800Error, OSError, ValueError) as e:
             if self.at.logger:
                 self.at.logger.error(f"getCBC failed: {e}")
             return None
 
+    @staticmethod
+    def _parse_cgmr(resp: ATResponse) -> Optional[str]:
+        """Extract firmware version from an AT+CGMR response."""
+        for line in resp.lines:
+            if "Revision" in line:
+                # Example: Revision:1418B05SIM800L24
+                parts = line.split(":")
+                if len(parts) >= 2:
+                    return parts[1].strip()
+        return None
+
+    @staticmethod
+    def _parse_cpin(resp: ATResponse) -> Optional[str]:
+        """Extract SIM status from an AT+CPIN? response."""
+        line = resp.first("+CPIN")
+        if line is not None:
+            return line.split(":")[1].strip()
+        return None
+
+    @staticmethod
+    def _parse_cbc(resp: ATResponse) -> Optional[Tuple[int, float]]:
+        """Extract (battery_percent, voltage_V) from an AT+CBC response."""
+        # bcs: battery charge status (0=not charging, 1=charging, 2=charging done)
+        # bcl: battery charge level (1-100%)
+        # voltage: battery voltage in mV
+        for line in resp.by_prefix.get("+CBC", ()):
+            m = _CBC_RE.match(line)
+            if m:
+                return (int(m.group(2)), int(m.group(3)) / 1000.0)
+        return None
+
     def getLocation(self, apn: Optional[str] = None) -> Optional[Tuple[float, float]]:
         """
         Get location via CIPGSMLOC (cell-based positioning).
@@ -224,24 +292,22 @@ class Info:
             resp = self.at.command(cmd, timeout_s=30, expect_ok=True)
             
             for line in resp.lines:
-                if line.startswith("+CIPGSMLOC:"):
-                    # +CIPGSMLOC: <loccode>,<longitude>,<latitude>,<date>,<time>
-                    parts = [p.strip() for p in line.split(":")[1].split(",")]
+                m = _CIPGSMLOC_RE.match(line)
+                if m:
+                    loccode = int(m.group(1))
                     
-                    if len(parts) >= 3:
-                        loccode = int(parts[0])
-                        
-                        if loccode != 0:
-                            raise LocationError(f"CIPGSMLOC error code {loccode}")
-                        
-                        longitude = float(parts[1])
-                        latitude = float(parts[2])
+                    if loccode != 0:
+                        raise LocationError(f"CIPGSMLOC error code {loccode}")
+                    
+                    if m.group(2) is not None:
+                        longitude = float(m.group(2))
+                        latitude = float(m.group(3))
                         
                         return (latitude, longitude)
             
             return None
             
-        except Exception as e:
+        except (SIM800Error, OSError, ValueError) as e:
             if self.at.logger:
                 self.at.logger.error(f"getLocation failed: {e}")
             return None
@@ -250,15 +316,51 @@ class Info:
         """
         Get all device information as dictionary.
         
+        Queries that are not cached go out in one batched AT write; getters
+        then fall back to their own query only if a batched answer could
+        not be parsed.
+        
         Returns:
             Dictionary with all available information
         """
+        # cache key -> (command, parser)
+        queries = {
+            'imei': ("AT+CGSN", self.network._parse_imei),
+            'iccid': ("AT+CCID", self.network._parse_iccid),
+            'module_version': ("AT+CGMR", self._parse_cgmr),
+            'signal': ("AT+CSQ", self.network._parse_signal),
+            'operator': ("AT+COPS?", self.network._parse_cops),
+            'battery': ("AT+CBC", self._parse_cbc),
+        }
+        now = time.monotonic()
+        pending = {
+            key: q for key, q in queries.items()
+            if not self._is_fresh(key, now)
+        }
+        
+        sim_status = None
+        try:
+            cmds = ["AT+CMEE=2", "AT+CPIN?"] + [cmd for cmd, _ in pending.values()]
+            responses = self.at.batch(cmds, timeout_s=5)
+            sim_status = self._parse_cpin(responses["AT+CPIN?"])
+            
+            for key, (cmd, parse) in pending.items():
+                try:
+                    value = parse(responses[cmd])
+                except ValueError:
+                    value = None
+                if value is not None:
+                    self._cache[key] = (now, value)
+        except (SIM800Error, OSError, ValueError) as e:
+            if self.at.logger:
+                self.at.logger.error(f"all() batch failed: {e}")
+        
         info = {}
         
         info['imei'] = self.getIMEI()
         info['iccid'] = self.getICCID()
         info['module_version'] = self.getModuleVersion()
-        info['sim_status'] = self.checkSim()
+        info['sim_status'] = sim_status if sim_status is not None else self.checkSim()
         info['rssi'] = self.getRSSI()
         info['signal_bars'] = self.getSignalBars()
         info['operator'] = self.getOperator()
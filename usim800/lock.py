@@ -1,14 +1,18 @@
 import os
-import fcntl
-import contextlib
+import threading
+
+from .locks import CombinedLock
+
+_locks = {}
+_locks_guard = threading.Lock()
 
 
-@contextlib.contextmanager
 def sim800_lock(lockfile="/tmp/usim800.lock"):
-    fd = os.open(lockfile, os.O_CREAT | os.O_RDWR, 0o666)
-    try:
-        fcntl.flock(fd, fcntl.LOCK_EX)
-        yield
-    finally:
-        fcntl.flock(fd, fcntl.LOCK_UN)
-        os.close(fd)
+    # One CombinedLock per lock file and process, so the fd is opened once
+    # and a forked child never inherits its parent's flock
+    key = (lockfile, os.getpid())
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = CombinedLock(lockfile=lockfile)
+    return lock.acquire()
@@ -7,6 +7,7 @@ concurrent access to the serial port from multiple threads or processes.
 from __future__ import annotations
 import os
 import threading
+import time
 from contextlib import contextmanager
 
 try:
@@ -27,28 +28,87 @@ class CombinedLock:
         self._tlock = threading.RLock()
         self._lockfile = lockfile
         self._fd = None
+        self._depth = 0
+        self._pid = os.getpid()
+        
+        # Keep the lock file open for the lifetime of the lock; each
+        # critical section then only costs flock(LOCK_EX) + flock(LOCK_UN).
+        if self._lockfile and fcntl is not None:
+            self._fd = os.open(self._lockfile, os.O_CREAT | os.O_RDWR, 0o666)
+    
+    def _check_fork(self) -> None:
+        """Reopen the lock file in a forked child.
+        
+        flock() locks belong to the open file description, which a child
+        shares with its parent: locking or unlocking the inherited fd would
+        act on the parent's lock. The child closes its copy (the parent's
+        stays open) and opens its own.
+        """
+        pid = os.getpid()
+        if pid == self._pid:
+            return
+        self._pid = pid
+        self._tlock = threading.RLock()
+        self._depth = 0
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = os.open(self._lockfile, os.O_CREAT | os.O_RDWR, 0o666)
+    
+    def close(self) -> None:
+        """Close the lock file descriptor (process lock is then disabled)."""
+        with self._tlock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     @contextmanager
     def acquire(self):
         """
         Acquire both thread and process locks.
         
+        Re-entrant: nested acquires from the owning thread only take the
+        process lock once.
+        
         Usage:
             with lock.acquire():
                 # Critical section
                 pass
         """
+        self._check_fork()
         with self._tlock:
-            if self._lockfile and fcntl is not None:
-                # Acquire process lock
-                self._fd = os.open(self._lockfile, os.O_CREAT | os.O_RDWR, 0o666)
-                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            if self._fd is None or self._depth:
+                # Thread lock only (Windows, no fcntl, or already held)
+                self._depth += 1
                 try:
                     yield
                 finally:
-                    fcntl.flock(self._fd, fcntl.LOCK_UN)
-                    os.close(self._fd)
-                    self._fd = None
-            else:
-                # Thread lock only (Windows or no fcntl)
+                    self._depth -= 1
+                return
+            
+            # Acquire process lock without blocking in the kernel: while
+            # another process holds it, drop the thread lock between
+            # attempts so other threads are not queued behind us.
+            backoff = 0.005
+            while True:
+                try:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    self._tlock.release()
+                    try:
+                        time.sleep(backoff)
+                    finally:
+                        self._tlock.acquire()
+                    backoff = min(backoff * 2, 0.05)
+            self._depth = 1
+            try:
                 yield
+            finally:
+                self._depth = 0
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -13,15 +13,32 @@ from __future__ import annotations
 import re
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
-from .at import ATChannel
-from .exceptions import NetworkError
+from .at import ATChannel, ATResponse
+from .exceptions import ATTimeoutError, NetworkError, SIM800Error
+
+
+# Query response: +CREG: <n>,<stat>[,"<lac>","<ci>"]
+# URC (CREG=1/2): +CREG: <stat>[,"<lac>","<ci>"]   (same for +CGREG)
+_REG_RE = re.compile(r"\+C?G?REG:\s*(\d+)(?:,(\d+))?")
+
+# First quoted field (operator name in +COPS / +CSPN)
+_QUOTED = re.compile(r'"([^"]+)"')
+
+# IMEI line (AT+CGSN / AT+GSN): 14+ digits only
+_DIGITS14 = re.compile(r"\d{14,}$")
+
+# RSSI (0-31) -> bars: <2:0, <10:1, <15:2, <20:3, <25:4, else 5
+_BARS = bytes([0] * 2 + [1] * 8 + [2] * 5 + [3] * 5 + [4] * 5 + [5] * 7)
 
 
 @dataclass
 class SignalQuality:
     """Signal quality information."""
+    # Manual __slots__ (dataclass(slots=True) needs Python 3.10+)
+    __slots__ = ("rssi", "ber")
+    
     rssi: int  # Received Signal Strength Indicator (0-31, 99=unknown)
     ber: int   # Bit Error Rate (0-7, 99=unknown)
 
@@ -49,18 +66,9 @@ class SignalQuality:
         - 4 bars: Good
         - 5 bars: Excellent
         """
-        if self.rssi == 99 or self.rssi < 2:
+        if self.rssi == 99 or self.rssi < 0:
             return 0
-        elif self.rssi < 10:
-            return 1
-        elif self.rssi < 15:
-            return 2
-        elif self.rssi < 20:
-            return 3
-        elif self.rssi < 25:
-            return 4
-        else:
-            return 5
+        return _BARS[min(self.rssi, 31)]
 
 
 class Network:
@@ -68,6 +76,15 @@ class Network:
     
     def __init__(self, at: ATChannel):
         self.at = at
+        
+        # Identity never changes for a given module / SIM: read once
+        self._imei: Optional[str] = None
+        self._iccid: Optional[str] = None
+
+    def invalidate_identity(self) -> None:
+        """Forget cached IMEI / ICCID (e.g. after a SIM swap)."""
+        self._imei = None
+        self._iccid = None
 
     def get_imei(self) -> str:
         """
@@ -79,18 +96,30 @@ class Network:
         Raises:
             NetworkError: If IMEI cannot be read
         """
+        if self._imei is not None:
+            return self._imei
+        
         # Try AT+CGSN (most common) and AT+GSN (fallback)
         for cmd in ("AT+CGSN", "AT+GSN"):
             try:
                 resp = self.at.command(cmd, timeout_s=3, expect_ok=True)
-                for line in resp.lines:
-                    if line.isdigit() and len(line) >= 14:
-                        return line
-            except:
+                imei = self._parse_imei(resp)
+                if imei:
+                    self._imei = imei
+                    return imei
+            except (SIM800Error, OSError):
                 continue
         
         raise NetworkError("Could not read IMEI")
 
+    @staticmethod
+    def _parse_imei(resp: ATResponse) -> Optional[str]:
+        """Extract IMEI from an AT+CGSN / AT+GSN response."""
+        for line in resp.lines:
+            if _DIGITS14.match(line):
+                return line
+        return None
+
     def get_iccid(self) -> str:
         """
         Get SIM card ICCID number.
@@ -101,14 +130,26 @@ class Network:
         Raises:
             NetworkError: If ICCID cannot be read
         """
+        if self._iccid is not None:
+            return self._iccid
+        
         resp = self.at.command("AT+CCID", timeout_s=3)
-        # Response: +CCID: 89860...
-        for line in resp.lines:
-            if line.startswith("+CCID"):
-                return line.split(":")[-1].strip()
+        iccid = self._parse_iccid(resp)
+        if iccid:
+            self._iccid = iccid
+            return iccid
         
         raise NetworkError("Could not read ICCID")
 
+    @staticmethod
+    def _parse_iccid(resp: ATResponse) -> Optional[str]:
+        """Extract ICCID from an AT+CCID response."""
+        # Response: +CCID: 89860...
+        line = resp.first("+CCID")
+        if line is not None:
+            return line.split(":")[-1].strip()
+        return None
+
     def sim_ready(self) -> bool:
         """
         Check if SIM card is ready.
@@ -118,10 +159,31 @@ class Network:
         """
         try:
             resp = self.at.command("AT+CPIN?", timeout_s=3)
-            return any("READY" in line for line in resp.lines)
-        except:
+            return "READY" in resp.blob
+        except (SIM800Error, OSError):
             return False
 
+    def probe_state(self) -> Tuple[bool, Optional[int]]:
+        """
+        Check SIM and network registration in one round-trip.
+        
+        Sends AT+CPIN?;+CREG? as a single line.
+        
+        Returns:
+            (sim_ready, creg_stat); creg_stat is None if it could not be read
+        """
+        try:
+            resp = self.at.command("AT+CPIN?;+CREG?", timeout_s=3, expect_ok=False)
+        except (SIM800Error, OSError):
+            return False, None
+        
+        cpin = resp.first("+CPIN")
+        creg = resp.first("+CREG")
+        return (
+            cpin is not None and "READY" in cpin,
+            self._parse_reg_stat(creg) if creg is not None else None,
+        )
+
     def get_signal(self) -> SignalQuality:
         """
         Get current signal quality.
@@ -133,15 +195,50 @@ class Network:
             NetworkError: If signal quality cannot be read
         """
         resp = self.at.command("AT+CSQ", timeout_s=3)
-        # Response: +CSQ: <rssi>,<ber>
-        for line in resp.lines:
-            if line.startswith("+CSQ:"):
-                _, rest = line.split(":", 1)
-                rssi_s, ber_s = [x.strip() for x in rest.split(",", 1)]
-                return SignalQuality(rssi=int(rssi_s), ber=int(ber_s))
+        sig = self._parse_signal(resp)
+        if sig is not None:
+            return sig
         
         raise NetworkError("Could not parse CSQ response")
 
+    @staticmethod
+    def _parse_signal(resp: ATResponse) -> Optional[SignalQuality]:
+        """Extract SignalQuality from an AT+CSQ response."""
+        # Response: +CSQ: <rssi>,<ber>
+        line = resp.first("+CSQ")
+        if line is not None:
+            _, rest = line.split(":", 1)
+            rssi_s, ber_s = [x.strip() for x in rest.split(",", 1)]
+            return SignalQuality(rssi=int(rssi_s), ber=int(ber_s))
+        return None
+
+    @staticmethod
+    def _parse_reg_stat(line: str) -> Optional[int]:
+        """
+        Extract <stat> from a +CREG/+CGREG query response or URC line.
+        
+        A second number means query format (<n>,<stat>); otherwise the
+        first number is the URC's <stat> (LAC/CI are quoted).
+        """
+        match = _REG_RE.match(line)
+        if not match:
+            return None
+        return int(match.group(2) or match.group(1))
+
+    def enable_registration_urcs(self) -> None:
+        """
+        Enable +CREG / +CGREG registration URCs (mode 2, with LAC/CI).
+        
+        Lets wait_registered() and GPRS.attach() wait for state changes
+        instead of polling. Best-effort (does not raise).
+        """
+        try:
+            self.at.command_batch(
+                ["AT+CREG=2", "AT+CGREG=2"], timeout_s=3, expect_ok=False
+            )
+        except (SIM800Error, OSError):
+            pass
+
     def wait_registered(
         self, 
         timeout_s: float = 60.0, 
@@ -162,26 +259,65 @@ class Network:
             Accepts registration status 1 (home) or 5 (roaming).
         """
         cmd = "AT+CGREG?" if gprs else "AT+CREG?"
-        deadline = time.time() + timeout_s
+        prefix = "+CGREG:" if gprs else "+CREG:"
         
-        while time.time() < deadline:
+        if not self._wait_stat({prefix: cmd}, timeout_s):
+            raise NetworkError(f"Not registered on network (cmd={cmd}) within {timeout_s}s")
+
+    def _wait_stat(self, pending: Dict[str, str], timeout_s: float) -> bool:
+        """
+        Wait until each prefix in 'pending' reports stat 1 or 5.
+        
+        Args:
+            pending: URC/response prefix -> query command; entries are
+                     removed as they register
+            timeout_s: Maximum time to wait
+        
+        Returns:
+            True once all are registered, False on timeout
+        """
+        pending = dict(pending)
+        deadline = time.monotonic() + timeout_s
+        poll_interval = 5.0
+        
+        while time.monotonic() < deadline:
+            # Current state (one batched query)
             try:
-                resp = self.at.command(cmd, timeout_s=3, retries=1)
-                for line in resp.lines:
-                    if line.startswith("+CREG:") or line.startswith("+CGREG:"):
-                        # Format: +CREG: n,stat or +CREG: stat
-                        parts = re.split(r"[:,]", line)
-                        parts = [p.strip() for p in parts if p.strip()]
-                        stat = int(parts[-1])
-                        
-                        if stat in (1, 5):  # 1=home, 5=roaming
-                            return
-            except:
+                responses = self.at.command_batch(
+                    list(pending.values()), timeout_s=3, expect_ok=False
+                )
+                for resp in responses:
+                    for prefix in list(pending):
+                        line = resp.first(prefix[:-1])  # "+CREG:" -> "+CREG"
+                        if line is not None and \
+                           self._parse_reg_stat(line) in (1, 5):
+                            del pending[prefix]  # 1=home, 5=roaming
+            except (SIM800Error, OSError):
                 pass
             
-            time.sleep(1.0)
+            if not pending:
+                return True
+            
+            # Then block on registration URCs (AT+CREG=2 / AT+CGREG=2, see
+            # enable_registration_urcs); re-query with backoff as a safety net
+            # in case URCs are off or one was missed.
+            wait_until = min(time.monotonic() + poll_interval, deadline)
+            while pending and time.monotonic() < wait_until:
+                try:
+                    urc = self.at.wait_for_urc(
+                        tuple(pending), timeout_s=max(wait_until - time.monotonic(), 0.1)
+                    )
+                except ATTimeoutError:
+                    break
+                if self._parse_reg_stat(urc) in (1, 5):
+                    pending.pop(urc.split(":", 1)[0] + ":", None)
+            
+            if not pending:
+                return True
+            
+            poll_interval = min(poll_interval * 2, 30.0)
         
-        raise NetworkError(f"Not registered on network (cmd={cmd}) within {timeout_s}s")
+        return False
     
     def get_operator(self) -> Optional[str]:
         """
@@ -193,21 +329,29 @@ class Network:
         try:
             # Try AT+COPS? first
             resp = self.at.command("AT+COPS?", timeout_s=5)
-            for line in resp.lines:
-                if line.startswith("+COPS:"):
-                    # +COPS: <mode>,<format>,"<oper>"
-                    match = re.search(r'"([^"]+)"', line)
-                    if match:
-                        return match.group(1)
+            oper = self._parse_cops(resp)
+            if oper:
+                return oper
             
             # Fallback to AT+CSPN?
             resp = self.at.command("AT+CSPN?", timeout_s=5)
-            for line in resp.lines:
-                if line.startswith("+CSPN:"):
-                    match = re.search(r'"([^"]+)"', line)
-                    if match:
-                        return match.group(1)
-        except:
+            line = resp.first("+CSPN")
+            if line is not None:
+                match = _QUOTED.search(line)
+                if match:
+                    return match.group(1)
+        except (SIM800Error, OSError):
             pass
         
         return None
+
+    @staticmethod
+    def _parse_cops(resp: ATResponse) -> Optional[str]:
+        """Extract operator name from an AT+COPS? response."""
+        # +COPS: <mode>,<format>,"<oper>"
+        line = resp.first("+COPS")
+        if line is not None:
+            match = _QUOTED.search(line)
+            if match:
+                return match.group(1)
+        return None
@@ -8,8 +8,13 @@ Handles:
 """
 from __future__ import annotations
 
+from typing import Callable, Optional
+
 from .at import ATChannel
-from .exceptions import PowerError
+from .exceptions import ATError, PowerError, SIM800Error
+
+_CFUN_MODES = (0, 1, 4)
+_CSCLK_MODES = (0, 1, 2)
 
 
 class Power:
@@ -22,8 +27,19 @@ class Power:
     - Power down command
     """
     
-    def __init__(self, at: ATChannel):
+    def __init__(self, at: ATChannel, on_radio_change: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            at: AT channel
+            on_radio_change: Called before CFUN / CPOWD, which drop any
+                             open bearer (e.g. to close reused HTTP state)
+        """
         self.at = at
+        self.on_radio_change = on_radio_change
+
+    def _radio_changing(self) -> None:
+        if self.on_radio_change is not None:
+            self.on_radio_change()
 
     def set_functionality(self, fun: int) -> None:
         """
@@ -38,9 +54,8 @@ class Power:
         Raises:
             PowerError: If unsupported mode
         """
-        if fun not in (0, 1, 4):
-            raise PowerError(f"CFUN mode {fun} not supported")
-        
+        self._check_fun(fun)
+        self._radio_changing()
         self.at.command(f"AT+CFUN={fun}", timeout_s=10)
 
     def set_sleep(self, mode: int) -> None:
@@ -56,10 +71,52 @@ class Power:
         Raises:
             PowerError: If invalid mode
         """
-        if mode not in (0, 1, 2):
+        self._check_sleep(mode)
+        self.at.command(f"AT+CSCLK={mode}", timeout_s=5)
+
+    @staticmethod
+    def _check_fun(fun: int) -> None:
+        if fun not in _CFUN_MODES:
+            raise PowerError(f"CFUN mode {fun} not supported")
+
+    @staticmethod
+    def _check_sleep(mode: int) -> None:
+        if mode not in _CSCLK_MODES:
             raise PowerError("CSCLK mode must be 0, 1 or 2")
+
+    def configure(self, fun: Optional[int] = None, sleep: Optional[int] = None) -> None:
+        """
+        Set functionality and sleep mode in one round-trip.
         
-        self.at.command(f"AT+CSCLK={mode}", timeout_s=5)
+        Sends AT+CFUN=<fun>;+CSCLK=<sleep> as a single line. Firmware that
+        rejects the chained form gets both commands in one batched write.
+        
+        Args:
+            fun: Functionality mode (see set_functionality), None to keep
+            sleep: Sleep mode (see set_sleep), None to keep
+            
+        Raises:
+            PowerError: If unsupported mode
+        """
+        if fun is None:
+            if sleep is not None:
+                self.set_sleep(sleep)
+            return
+        if sleep is None:
+            self.set_functionality(fun)
+            return
+        
+        self._check_fun(fun)
+        self._check_sleep(sleep)
+        self._radio_changing()
+        
+        try:
+            self.at.command(f"AT+CFUN={fun};+CSCLK={sleep}", timeout_s=10)
+        except ATError:
+            # Chaining not accepted: same commands, one write
+            self.at.command_batch(
+                [f"AT+CFUN={fun}", f"AT+CSCLK={sleep}"], timeout_s=10
+            )
 
     def enable_auto_sleep(self) -> None:
         """
@@ -86,9 +143,10 @@ class Power:
             Module might power off before responding.
         """
         mode = 0 if urgent else 1
+        self._radio_changing()
         try:
             self.at.command(f"AT+CPOWD={mode}", timeout_s=5, expect_ok=False)
-        except:
+        except (SIM800Error, OSError):
             pass  # Module might power off before responding
 
     def minimum_functionality(self) -> None:
@@ -6,6 +6,7 @@ Provides robust session-based workflow with automatic cleanup.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 from .at import ATChannel
 from .gprs import GPRS
@@ -13,6 +14,8 @@ from .http import HTTP
 from .sms import SMS
 from .network import Network
 from .power import Power
+from .exceptions import SIM800Error
+from .lock import sim800_lock
 
 
 @dataclass
@@ -22,6 +25,8 @@ class SessionConfig:
     cid: int = 1
     # Default: close bearer on exit (safer + consistent with README examples)
     keep_bearer_open: bool = False
+    # If set (e.g. 115200), switch the modem to this rate via AT+IPR on enter
+    baudrate: Optional[int] = None
 
 
 class SIM800Session:
@@ -58,42 +63,45 @@ class SIM800Session:
         Enter session context.
         
         Performs:
-        1. Sync with modem
+        1. Sync with modem (optionally switching baudrate)
         2. Best-effort cleanup from previous run
         3. Wait for network registration
-        4. Attach to GPRS
+        4. Attach to GPRS and wait for GPRS registration
         5. Open bearer
         6. Initialize HTTP service
         """
-        # Sync with modem
-        self.at.sync()
+        # Sync with modem (and upgrade baudrate if configured)
+        self.at.sync(baudrate=self.cfg.baudrate)
         
-        # Best-effort cleanup from previous run (crash recovery)
+        # Best-effort cleanup from previous run (crash recovery) and
+        # registration URCs (see Network.enable_registration_urcs), in one
+        # batched write
         try:
-            self.http.term()
-        except:
-            pass
-        
-        try:
-            self.at.command(
-                f"AT+SAPBR=0,{self.cfg.cid}", 
-                timeout_s=5, 
-                expect_ok=False
+            self.at.command_batch(
+                [
+                    "AT+HTTPTERM",
+                    f"AT+SAPBR=0,{self.cfg.cid}",
+                    "AT+CREG=2",
+                    "AT+CGREG=2",
+                ],
+                timeout_s=5,
+                expect_ok=False,
             )
-        except:
+        except (SIM800Error, OSError):
             pass
         
         # Wait for SIM ready
         if not self.net.sim_ready():
             raise Exception("SIM card not ready")
         
-        # Wait for network registration
+        # Wait for network registration (CREG only: without auto-attach,
+        # CGREG does not reach 1/5 before AT+CGATT=1)
         self.net.wait_registered(timeout_s=60, gprs=False)
         
         # Attach to GPRS
         self.gprs.attach(timeout_s=30)
         
-        # Wait for GPRS registration
+        # Wait for GPRS registration (immediate once attached)
         self.net.wait_registered(timeout_s=60, gprs=True)
         
         # Open bearer
@@ -115,12 +123,72 @@ class SIM800Session:
         # Always terminate HTTP
         try:
             self.http.term()
-        except:
+        except (SIM800Error, OSError):
             pass
         
         # Close bearer if configured
         if not self.cfg.keep_bearer_open:
             try:
                 self.gprs.close()
-            except:
+            except (SIM800Error, OSError):
                 pass
+
+
+class OSLockedSession(SIM800Session):
+    """
+    SIM800Session that holds the modem lock for its whole lifetime.
+    
+    Other threads/processes using the same lock file wait until the
+    session exits, instead of interleaving AT commands between requests.
+    
+    Usage:
+        with OSLockedSession(gsm, apn="www") as session:
+            resp = session.http.get("http://example.com")
+    """
+    
+    def __init__(
+        self,
+        at,
+        apn: str,
+        lockfile: str | None = "/tmp/usim800.lock",
+        cid: int = 1,
+        keep_bearer_open: bool = False,
+    ):
+        # Accept a device object (legacy sim800) as well as an ATChannel
+        at = getattr(at, "_at", at)
+        super().__init__(
+            at,
+            SessionConfig(apn=apn, cid=cid, keep_bearer_open=keep_bearer_open),
+        )
+        self._lockfile = lockfile
+        self._held = None
+
+    def _lock(self):
+        # The channel's own lock is re-entrant; a second descriptor on the
+        # same file (sim800_lock) would block against the channel's flock
+        if self._lockfile == self.at.lock._lockfile:
+            return self.at.lock.acquire()
+        return sim800_lock(self._lockfile)
+
+    def __enter__(self) -> 'OSLockedSession':
+        held = self._lock()
+        held.__enter__()
+        try:
+            super().__enter__()
+        except BaseException as e:
+            held.__exit__(type(e), e, e.__traceback__)
+            raise
+        self._held = held
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        held, self._held = self._held, None
+        try:
+            super().__exit__(exc_type, exc, tb)
+        finally:
+            if held is not None:
+                held.__exit__(exc_type, exc, tb)
+
+
+# Name used by the legacy usim800.usim800 module
+Sim800Session = OSLockedSession
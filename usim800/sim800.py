@@ -14,7 +14,12 @@ from __future__ import annotations
 
 import logging
 from contextlib import contextmanager
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import orjson as _json  # optional, much faster on large bodies
+except ImportError:  # pragma: no cover
+    import json as _json
 
 from .at import ATChannel
 from .network import Network
@@ -35,17 +40,36 @@ class RequestsWrapper:
         gsm.requests.get(url="http://...")
         r = gsm.requests
         print(r.status_code, r.content, r.IP)
+    
+    The bearer and HTTP service are opened on the first request and kept
+    open for the next ones; they are torn down by sim800.close(), by
+    gsm.power CFUN / CPOWD calls, after a failed request, or after every
+    request if autoclose=True (the original behaviour). A request that
+    fails on a reused bearer is retried once on a fresh one.
     """
     
-    def __init__(self, parent: 'sim800'):
+    def __init__(self, parent: 'sim800', autoclose: bool = False):
         self._parent = parent
         self._apn: Optional[str] = None
+        self.autoclose = autoclose
+        
+        # Bearer / HTTP service reused across requests
+        self._gprs: Optional[GPRS] = None
+        self._http: Optional[HTTP] = None
+        self._bearer_ready = False
+        self._http_ready = False
+        self._bearer_ip: Optional[str] = None
+        
+        # If True, .IP re-queries the open bearer (AT+SAPBR=2) on every
+        # access; otherwise the IP reported when the bearer opened is reused
+        self.query_ip_each_call = False
         
         # Response attributes (backward compatible)
         self._status_code: Optional[str] = None
         self._content: Optional[bytes] = None
         self._text: Optional[str] = None
         self._json: Optional[list] = None
+        self._json_parsed = False
         self._url: Optional[str] = None
         self._ip: Optional[str] = None
 
@@ -57,6 +81,9 @@ class RequestsWrapper:
     @APN.setter
     def APN(self, apn: str):
         """Set APN for requests."""
+        if apn != self._apn:
+            # Bearer was configured for the old APN
+            self.close()
         self._apn = apn
 
     @property
@@ -71,12 +98,24 @@ class RequestsWrapper:
 
     @property
     def text(self) -> Optional[str]:
-        """Get last response as text."""
+        """Get last response as text (decoded on first access)."""
+        if self._text is None and self._content is not None:
+            self._text = self._content.decode(errors="ignore")
         return self._text
 
     @property
     def IP(self) -> Optional[str]:
-        """Get assigned IP address from last request."""
+        """
+        Get assigned IP address from last request.
+        
+        With query_ip_each_call set, the open bearer is re-queried first.
+        """
+        if self.query_ip_each_call and self._bearer_ready and self._ip is not None:
+            try:
+                self._bearer_ip = self._gprs.query().ip
+                self._ip = self._bearer_ip
+            except (SIM800Error, OSError):
+                pass
         return self._ip
 
     @property
@@ -90,19 +129,19 @@ class RequestsWrapper:
         
         Returns list for compatibility with original implementation.
         """
-        if self._json is not None:
+        if self._json_parsed:
             return self._json
         
         if self._content:
-            import json
             try:
-                parsed = json.loads(self._content)
+                parsed = _json.loads(self._content)
                 # Wrap in list for compatibility
-                return [parsed] if not isinstance(parsed, list) else parsed
-            except:
-                return None
+                self._json = [parsed] if not isinstance(parsed, list) else parsed
+            except ValueError:
+                self._json = None
+            self._json_parsed = True
         
-        return None
+        return self._json
 
     def _init_response(self):
         """Reset response attributes."""
@@ -110,6 +149,7 @@ class RequestsWrapper:
         self._content = None
         self._text = None
         self._json = None
+        self._json_parsed = False
         self._url = None
         self._ip = None
 
@@ -117,64 +157,115 @@ class RequestsWrapper:
         """Store response for property access."""
         self._status_code = str(resp.status_code)
         self._content = resp.data
-        self._text = resp.text
+        self._text = None  # decoded lazily by .text
         self._url = url
         self._ip = ip
 
-    def get(self, url: str, header=None) -> str:
+    def _ensure_ready(self) -> HTTP:
         """
-        Execute HTTP GET request.
+        Open bearer and HTTP service unless they are already open.
         
-        Args:
-            url: Full URL
-            header: Custom headers (not fully implemented in SIM800)
-            
         Returns:
-            Status code as string
+            HTTP client ready for requests
         """
-        self._init_response()
-        
-        if not self._apn:
-            raise SIM800Error("APN not configured. Set gsm.requests.APN first.")
-        
-        # Open bearer and execute request
-        gprs = GPRS(self._parent._at, apn=self._apn, cid=1)
-        http = HTTP(self._parent._at, cid=1)
-        
-        try:
+        if not self._bearer_ready:
             # Ensure network ready
             self._parent._ensure_network_ready()
             
-            # Open bearer
-            gprs.attach(timeout_s=30)
-            status = gprs.open()
-            self._ip = status.ip
-            
-            # Execute HTTP request
-            http.init()
-            resp = http.get(url, timeout_s=120)
-            
-            # Store response
-            self._store_response(resp, url, self._ip)
-            
-            # Cleanup
-            http.term()
-            gprs.close()
-            
-            return self._status_code
+            self._gprs = GPRS(self._parent._at, apn=self._apn, cid=1)
+            self._http = HTTP(self._parent._at, cid=1)
             
-        except Exception as e:
-            # Cleanup on error
+            # Open bearer
+            self._gprs.attach(timeout_s=30)
+            status = self._gprs.open()
+            self._bearer_ip = status.ip
+            self._bearer_ready = True
+        
+        if not self._http_ready:
+            self._http.init()
+            self._http_ready = True
+        
+        return self._http
+
+    def close(self) -> None:
+        """
+        Terminate HTTP service and close bearer (best-effort).
+        
+        The next request opens them again.
+        """
+        if self._http_ready:
             try:
-                http.term()
-            except:
+                self._http.term()
+            except (SIM800Error, OSError):
                 pass
+        if self._bearer_ready:
             try:
-                gprs.close()
-            except:
+                self._gprs.close()
+            except (SIM800Error, OSError):
                 pass
-            
+        
+        self._http_ready = False
+        self._bearer_ready = False
+        self._bearer_ip = None
+
+    def _run(self, do_request) -> HTTPResponse:
+        """
+        Run do_request(http) on the shared bearer.
+        
+        A bearer kept open from an earlier request may have gone away
+        underneath us (CFUN, CPOWD, network PDP deactivation): if a request
+        on it fails, it is torn down and the request retried once on a
+        fresh setup. Any failure leaves nothing marked ready.
+        """
+        reused = self._bearer_ready and self._http_ready
+        try:
+            return do_request(self._ensure_ready())
+        except (SIM800Error, OSError):
+            self.close()
+            if not reused:
+                raise
+        except Exception:
+            # Unknown modem state: start over on the next request
+            self.close()
             raise
+        
+        try:
+            return do_request(self._ensure_ready())
+        except Exception:
+            self.close()
+            raise
+
+    def _request(self, url: str, do_request) -> str:
+        """Run do_request(http) on the shared bearer and store the response."""
+        self._init_response()
+        
+        if not self._apn:
+            raise SIM800Error("APN not configured. Set gsm.requests.APN first.")
+        
+        resp = self._run(do_request)
+        
+        # Store response
+        self._store_response(resp, url, self._bearer_ip)
+        
+        if self.autoclose:
+            self.close()
+        
+        return self._status_code
+
+    def get(self, url: str, header=None) -> str:
+        """
+        Execute HTTP GET request.
+        
+        Args:
+            url: Full URL
+            header: Custom headers (not fully implemented in SIM800)
+            
+        Returns:
+            Status code as string
+        """
+        return self._request(
+            url, lambda http: http.get(url, timeout_s=120)
+        )
 
     def post(self, url: str, data, waittime=4000, bytes_data=None, headers=None) -> str:
         """
@@ -190,54 +281,58 @@ class RequestsWrapper:
         Returns:
             Status code as string
         """
-        self._init_response()
-        
-        if not self._apn:
-            raise SIM800Error("APN not configured. Set gsm.requests.APN first.")
-        
-        # Open bearer and execute request
-        gprs = GPRS(self._parent._at, apn=self._apn, cid=1)
-        http = HTTP(self._parent._at, cid=1)
-        
-        try:
-            # Ensure network ready
-            self._parent._ensure_network_ready()
-            
-            # Open bearer
-            gprs.attach(timeout_s=30)
-            status = gprs.open()
-            self._ip = status.ip
-            
-            # Execute HTTP request
-            http.init()
-            resp = http.post(
+        return self._request(
+            url,
+            lambda http: http.post(
                 url=url,
                 data=data,
                 httpdata_timeout_ms=waittime,
                 timeout_s=120
             )
+        )
+
+    def iget_many(
+        self, urls: Iterable[str], headers: Optional[Dict[str, str]] = None
+    ) -> Iterator[HTTPResponse]:
+        """
+        Execute HTTP GET for each URL on one bearer / HTTP service.
+        
+        Bearer and HTTPINIT are set up once; each URL then costs only
+        HTTPPARA URL, HTTPACTION and HTTPREAD. Responses are yielded as
+        they arrive; the last one is also available via status_code/text.
+        
+        Args:
+            urls: Full URLs
+            headers: Custom headers sent with every request
             
-            # Store response
-            self._store_response(resp, url, self._ip)
-            
-            # Cleanup
-            http.term()
-            gprs.close()
-            
-            return self._status_code
-            
-        except Exception as e:
-            # Cleanup on error
-            try:
-                http.term()
-            except:
-                pass
-            try:
-                gprs.close()
-            except:
-                pass
-            
-            raise
+        Yields:
+            HTTPResponse per URL, in order
+        """
+        if not self._apn:
+            raise SIM800Error("APN not configured. Set gsm.requests.APN first.")
+        
+        try:
+            for url in urls:
+                self._init_response()
+                resp = self._run(
+                    lambda http: http.get(url, headers=headers, timeout_s=120)
+                )
+                self._store_response(resp, url, self._bearer_ip)
+                yield resp
+        finally:
+            if self.autoclose:
+                self.close()
+
+    def get_many(
+        self, urls: Iterable[str], headers: Optional[Dict[str, str]] = None
+    ) -> List[HTTPResponse]:
+        """
+        Same as iget_many(), collected into a list.
+        
+        Returns:
+            HTTPResponse per URL, in order
+        """
+        return list(self.iget_many(urls, headers=headers))
 
 
 class sim800:
@@ -259,7 +354,8 @@ class sim800:
         path: str,
         timeout: float = 1.0,
         lockfile: str | None = "/tmp/usim800.lock",
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        negotiate_baud: Optional[int] = None,
     ):
         """
         Initialize SIM800 device.
@@ -270,6 +366,8 @@ class sim800:
             timeout: Serial read timeout
             lockfile: Path to lock file for process locking
             logger: Optional logger instance
+            negotiate_baud: If set (e.g. 115200), switch the modem to this
+                            rate via AT+IPR on first use
         """
         # Create AT channel (owns the serial port)
         self._at = ATChannel(
@@ -287,10 +385,12 @@ class sim800:
         self.requests = RequestsWrapper(self)
         self.sms = SMS(self._at)
         self.info = Info(self._at, self._network)
-        self.power = Power(self._at)
+        # CFUN / CPOWD drop the bearer: forget requests' reused state
+        self.power = Power(self._at, on_radio_change=self.requests.close)
         
         # Internal state
         self._initialized = False
+        self._negotiate_baud = negotiate_baud
 
     def _ensure_network_ready(self):
         """
@@ -299,15 +399,20 @@ class sim800:
         Called automatically before network operations.
         """
         if not self._initialized:
-            # Sync with modem
-            self._at.sync()
+            # Sync with modem (and upgrade baudrate if requested)
+            self._at.sync(baudrate=self._negotiate_baud)
             
-            # Wait for SIM ready
-            if not self._network.sim_ready():
+            # Registration changes arrive as URCs from now on
+            self._network.enable_registration_urcs()
+            
+            # SIM + registration state in one round-trip
+            ready, stat = self._network.probe_state()
+            if not ready:
                 raise SIM800Error("SIM card not ready")
             
-            # Wait for network registration
-            self._network.wait_registered(timeout_s=60, gprs=False)
+            # Wait for network registration unless already registered
+            if stat not in (1, 5):
+                self._network.wait_registered(timeout_s=60, gprs=False)
             
             self._initialized = True
 
@@ -328,18 +433,30 @@ class sim800:
         """
         from .session import SIM800Session, SessionConfig
         
-        cfg = SessionConfig(apn=apn, cid=1, keep_bearer_open=keep_bearer_open)
+        cfg = SessionConfig(
+            apn=apn,
+            cid=1,
+            keep_bearer_open=keep_bearer_open,
+            baudrate=self._negotiate_baud,
+        )
         session = SIM800Session(self._at, cfg)
         
+        # The session terminates HTTP / the bearer on the same cid: drop
+        # requests' reused state so its next call sets them up again
+        self.requests.close()
         try:
             session.__enter__()
             yield session
         finally:
-            session.__exit__(None, None, None)
+            try:
+                session.__exit__(None, None, None)
+            finally:
+                self.requests.close()
 
     def close(self):
-        """Close serial port."""
+        """Close HTTP service / bearer left open by requests, then the serial port."""
+        self.requests.close()
         try:
             self._at.close()
-        except:
+        except OSError:
             pass
@@ -8,13 +8,30 @@ Features:
 """
 from __future__ import annotations
 
+import binascii
 import re
 import time
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from .at import ATChannel
-from .exceptions import SMSError
+from .at import ATChannel, ATResponse
+from .exceptions import SIM800Error, SMSError
+
+# Shared header tail: "<stat>","<oa>"[,<alpha>[,"<scts>"[,<CSDH fields>]]]
+# (stored messages, e.g. "STO UNSENT", have no scts)
+_HEADER_TAIL = r'"([^"]+)","([^"]*)"(?:,("[^"]*"|[^,]*)(?:,"([^"]*)")?)?'
+
+# +CMGL: <index>,<tail>
+_CMGL_PREFIX = '+CMGL: '
+_CMGL_RE = re.compile(r'\+CMGL:\s*(\d+),' + _HEADER_TAIL)
+# +CMGR: <tail>
+_CMGR_RE = re.compile(r'\+CMGR:\s*' + _HEADER_TAIL)
+# Same, for parsing the raw response bytes in readAll()
+_CMGL_PREFIX_B = b'+CMGL: '
+_CMGL_RE_B = re.compile(_CMGL_RE.pattern.encode('ascii'))
+
+# bytes.translate delete set: hex digits (either case)
+_HEX_DIGITS = b'0123456789abcdefABCDEF'
 
 
 @dataclass
@@ -27,70 +44,91 @@ class SMSMessage:
     text: str
 
 
-def _try_decode_utf16_encoded_string(s):
+def _try_decode_utf16_encoded_string(line: bytes) -> str:
     """
-    Decode UTF-16 hex string if valid, otherwise return as-is.
+    Decode a raw line as UTF-16 hex if valid, otherwise as text.
     
     From original usim800 library (community contribution).
     """
-    prepared = s.strip().lower()
-    if len(prepared) % 4 != 0:
-        return s
-    for c in prepared:
-        if c not in '0123456789abcdef':
-            return s
-    
-    # It is a UTF-16 encoded string, decode it
-    result_str = ''
-    for i in range(len(prepared) // 4):
-        decoded_char = chr(int(prepared[i*4:(i+1)*4], 16))
-        result_str += decoded_char
-    return result_str
+    prepared = line.strip()
+    # Anything left after deleting hex digits is not hex
+    if len(prepared) % 4 == 0 and not prepared.translate(None, _HEX_DIGITS):
+        # It is a UTF-16 encoded string, decode it
+        try:
+            return binascii.unhexlify(prepared).decode('utf-16-be')
+        except UnicodeDecodeError:
+            pass
+    return line.decode(errors='ignore')
+
 
+def _encode_gsm(number: str, text: str) -> Tuple[str, bytes, bytes]:
+    """Charset, CMGS number and body for an ASCII message."""
+    return (
+        "GSM",
+        number.encode("ascii", errors="ignore"),
+        text.encode("ascii", errors="ignore"),
+    )
 
-def _parse_cmgl_response(cmgl_response_str):
+
+def _encode_ucs2(number: str, text: str) -> Tuple[str, bytes, bytes]:
+    """Charset, CMGS number and body (UTF-16BE hex) for a Unicode message."""
+    return (
+        "UCS2",
+        binascii.hexlify(number.encode("utf-16-be")).upper(),
+        binascii.hexlify(text.encode("utf-16-be")).upper(),
+    )
+
+
+def _parse_cmgl_response(cmgl_response: bytes):
     """
-    Parse AT+CMGL response.
+    Parse raw AT+CMGL response bytes.
     
     From original usim800 library (community contribution).
-    Handles multiple SMS entries with proper parsing.
+    Handles multiple SMS entries with proper parsing. Only header fields
+    and body lines are decoded, not the whole buffer.
     """
-    ENTRY_HEADLINE_PREFIX = '+CMGL: '
+    # Cut at the final OK in one scan, so the loop needs no terminator
+    # check (rfind: a message body may itself read "OK")
+    end = cmgl_response.rfind(b'\r\nOK\r\n')
+    if end >= 0:
+        cmgl_response = cmgl_response[:end]
+    
     result_dict = {}
     curr_entry = None
+    curr_body = []  # Decoded body lines of curr_entry, joined once
+    match_headline = _CMGL_RE_B.match
     
-    for line in cmgl_response_str.replace('\r', '\n').split('\n'):
-        if line.startswith(ENTRY_HEADLINE_PREFIX):
+    for line in cmgl_response.splitlines():
+        if line.startswith(_CMGL_PREFIX_B):
             # New entry starts - save previous
             if curr_entry is not None:
+                curr_entry.append(''.join(curr_body))
                 result_dict[curr_entry[0]] = curr_entry
                 curr_entry = None
             
             # Parse headline: +CMGL: ID,"STATUS","NUMBER",,"DATETIME"
-            headline_fields = line.split(',"')
-            if len(headline_fields) != 5:
+            m = match_headline(line)
+            if m is None:
                 continue
             
-            headline_fields = [f.strip('"') for f in headline_fields]
-            msg_id = headline_fields[0][len(ENTRY_HEADLINE_PREFIX):]
-            
-            curr_entry = headline_fields
-            curr_entry[0] = msg_id
-            curr_entry.append('')  # Body text
+            msg_id, status, number, alpha, timestamp = [
+                f.decode(errors='ignore') for f in m.groups(b'')
+            ]
+            curr_entry = [msg_id, status, number, alpha.strip('"'), timestamp]
+            curr_body = []
         else:
             # Body line
             if curr_entry is None:
                 continue
-            if line.strip() == '':
+            if not line.strip():
                 continue
-            if line.strip().lower() == 'ok':
-                break
             
             # Add text to current entry
-            curr_entry[-1] += _try_decode_utf16_encoded_string(line) + '\n'
+            curr_body.append(_try_decode_utf16_encoded_string(line) + '\n')
     
     # Add last entry
     if curr_entry is not None:
+        curr_entry.append(''.join(curr_body))
         result_dict[curr_entry[0]] = curr_entry
     
     return result_dict
@@ -111,23 +149,43 @@ class SMS:
 
     def __init__(self, at: ATChannel):
         self.at = at
+        
+        # Last AT+CMGF / AT+CSCS values set, so repeated calls are skipped
+        self._cmgf_mode: Optional[int] = None
+        self._charset: Optional[str] = None
+
+    def invalidate_modes(self) -> None:
+        """Forget cached CMGF / CSCS state (e.g. after a modem restart)."""
+        self._cmgf_mode = None
+        self._charset = None
+
+    def _command(self, cmd: str, timeout_s: float, expect_ok: bool = True) -> ATResponse:
+        """at.command() that forgets cached modes when the command fails."""
+        try:
+            return self.at.command(cmd, timeout_s=timeout_s, expect_ok=expect_ok)
+        except (SIM800Error, OSError):
+            self.invalidate_modes()
+            raise
 
     def text_mode(self) -> None:
         """Set SMS text mode."""
-        self.at.command("AT+CMGF=1", timeout_s=5)
+        if self._cmgf_mode == 1:
+            return
+        self._command("AT+CMGF=1", timeout_s=5)
+        self._cmgf_mode = 1
 
     def _needs_ucs2(self, text: str) -> bool:
         """Return True if text contains non-GSM-7 characters (rough heuristic)."""
-        try:
-            text.encode("gsm0338")  # type: ignore[attr-defined]
-            return False
-        except Exception:
-            # Python doesn't ship gsm0338 codec by default; fallback heuristic
-            return any(ord(ch) > 127 for ch in text)
+        # The non-UCS2 path sends ASCII only, so ASCII is the right test
+        # (a str flag check in CPython, no scan)
+        return not text.isascii()
 
     def _set_charset(self, charset: str) -> None:
         """Set TE character set."""
-        self.at.command(f'AT+CSCS="{charset}"', timeout_s=5)
+        if self._charset == charset:
+            return
+        self._command(f'AT+CSCS="{charset}"', timeout_s=5)
+        self._charset = charset
 
     def set_new_message_indication(self, mode: int = 2, mt: int = 1) -> None:
         """
@@ -150,54 +208,52 @@ class SMS:
             True if sent successfully, False otherwise
         """
         try:
-            self.text_mode()
-
             # If message contains non-ASCII, use UCS2 text mode.
             # This is widely supported on SIM800 for Unicode SMS.
-            use_ucs2 = self._needs_ucs2(text) or self._needs_ucs2(number)
-            if use_ucs2:
-                self._set_charset("UCS2")
-                number_to_send = number.encode("utf-16-be").hex().upper()
-                text_bytes = text.encode("utf-16-be").hex().upper().encode("ascii")
+            # Chosen per message: UCS2 would cut an ASCII SMS to 70 chars.
+            if self._needs_ucs2(text) or self._needs_ucs2(number):
+                encode = _encode_ucs2
             else:
-                self._set_charset("GSM")
-                number_to_send = number
-                text_bytes = text.encode("ascii", errors="ignore")
+                encode = _encode_gsm
+            charset, number_to_send, text_bytes = encode(number, text)
+            
+            # Build both writes before taking the lock
+            at = self.at
+            write_raw = at.write_raw
+            cmd = b'AT+CMGS="' + number_to_send + b'"\r\n'
+            body = text_bytes + b"\x1A"  # body + Ctrl+Z
             
-            with self.at.lock.acquire():
-                self.at.write_raw(self.at.sleep_wake_char)
-                time.sleep(self.at.sleep_wake_delay_s)
+            with at.lock.acquire():
+                # Cached: no AT traffic when mode/charset are already set.
+                # Under the (re-entrant) lock so another thread's send cannot
+                # switch the charset between here and AT+CMGS.
+                if self._cmgf_mode != 1 or self._charset != charset:
+                    self.text_mode()
+                    self._set_charset(charset)
+                
+                write_raw(at.sleep_wake_char)
+                time.sleep(at.sleep_wake_delay_s)
 
-                cmd = f'AT+CMGS="{number_to_send}"\r\n'.encode("ascii", errors="ignore")
-                self.at.write_raw(cmd)
+                at._drain_if_needed()
+                write_raw(cmd)
 
-                # Wait for '>' prompt
-                deadline = time.time() + 10.0
-                got_prompt = False
-                
-                while time.time() < deadline:
-                    chunk = self.at.ser.read(self.at.ser.in_waiting or 1)
-                    if chunk:
-                        if b">" in chunk:
-                            got_prompt = True
-                            break
-                    else:
-                        time.sleep(0.05)
+                # Wait for '>' prompt (blocking read, no polling)
+                with at._port_timeout(10.0) as ser:
+                    got_prompt = ser.read_until(b">", size=256).endswith(b">")
                 
                 if not got_prompt:
                     raise SMSError("No '>' prompt from AT+CMGS")
 
-                # Send body + Ctrl+Z
-                body = text_bytes + b"\x1A"
-                self.at.write_raw(body)
+                write_raw(body)
 
                 # Wait for OK/ERROR
-                resp = self.at._read_until_terminal(timeout_s=timeout_s)
-                self.at._raise_if_error("AT+CMGS", resp)
+                resp = at._read_until_terminal(timeout_s=timeout_s)
             
+            at._raise_if_error("AT+CMGS", resp)
             return True
             
         except Exception as e:
+            self.invalidate_modes()
             if self.at.logger:
                 self.at.logger.error(f"SMS send failed: {e}")
             return False
@@ -215,9 +271,8 @@ class SMS:
             self.text_mode()
 
             # Use the robust ATChannel reader (handles timeouts, locking, errors)
-            resp = self.at.command('AT+CMGL="ALL"', timeout_s=20, expect_ok=True)
-            raw_text = resp.raw.decode(errors="ignore")
-            return _parse_cmgl_response(raw_text)
+            resp = self._command('AT+CMGL="ALL"', timeout_s=20)
+            return _parse_cmgl_response(resp.raw)
 
         except Exception as e:
             if self.at.logger:
@@ -235,7 +290,7 @@ class SMS:
             List of SMSMessage objects
         """
         self.text_mode()
-        resp = self.at.command(f'AT+CMGL="{status}"', timeout_s=10, expect_ok=True)
+        resp = self._command(f'AT+CMGL="{status}"', timeout_s=10)
         return self._parse_cmgl(resp.lines)
 
     def read(self, index: int) -> SMSMessage:
@@ -252,7 +307,7 @@ class SMS:
             SMSError: If message not found
         """
         self.text_mode()
-        resp = self.at.command(f"AT+CMGR={index}", timeout_s=10, expect_ok=True)
+        resp = self._command(f"AT+CMGR={index}", timeout_s=10)
         msgs = self._parse_cmgr(resp.lines, index=index)
         
         if not msgs:
@@ -269,7 +324,7 @@ class SMS:
             delflag: Delete flag (0=delete index only, 1=delete all read, etc.)
         """
         self.text_mode()
-        self.at.command(f"AT+CMGD={index},{delflag}", timeout_s=10)
+        self._command(f"AT+CMGD={index},{delflag}", timeout_s=10)
 
     def deleteAllReadMsg(self, index=None):
         """
@@ -281,18 +336,21 @@ class SMS:
             index: Index of any existing message (speeds up operation)
         """
         try:
-            # API requires an index, so read all if not provided
+            # API requires an index: take the first read message. Only the
+            # header is needed, and listing "ALL" would mark unread ones read.
             if index is None:
-                msgs = self.readAll()
-                if len(msgs) == 0:
+                self.text_mode()
+                resp = self._command('AT+CMGL="REC READ",1', timeout_s=20)
+                m = _CMGL_RE.match(resp.first("+CMGL") or "")
+                if m is None:
                     return
-                index = list(msgs.keys())[0]
+                index = m.group(1)
             
             if not isinstance(index, str):
                 index = str(index)
             
             cmd = f"AT+CMGD={index},1"
-            self.at.command(cmd, timeout_s=10)
+            self._command(cmd, timeout_s=10)
             
         except Exception as e:
             if self.at.logger:
@@ -303,20 +361,23 @@ class SMS:
     def _parse_cmgl(self, lines: list[str]) -> List[SMSMessage]:
         """Parse AT+CMGL response lines."""
         out: List[SMSMessage] = []
+        append = out.append
+        match_headline = _CMGL_RE.match
         i = 0
         
         while i < len(lines):
             line = lines[i]
             if line.startswith("+CMGL:"):
                 # +CMGL: <index>,"<stat>","<oa>",,"<scts>"
-                match = re.search(
-                    r'\+CMGL:\s*(\d+),\"([^\"]+)\",\"([^\"]*)\".*\"([^\"]*)\"', 
-                    line
-                )
-                idx = int(match.group(1)) if match else -1
-                stat = match.group(2) if match else ""
-                sender = match.group(3) if match else ""
-                ts = match.group(4) if match else ""
+                # (regex kept over a partition() parse: the alpha field may be
+                # "" or empty and CSDH=1 appends fields; a manual split that
+                # handles both measured no faster)
+                match = match_headline(line)
+                if match:
+                    idx_s, stat, sender, _, ts = match.groups("")
+                    idx = int(idx_s)
+                else:
+                    idx, stat, sender, ts = -1, "", "", ""
                 
                 text = ""
                 if i + 1 < len(lines) and \
@@ -325,7 +386,7 @@ class SMS:
                     text = lines[i + 1]
                     i += 1
                 
-                out.append(SMSMessage(
+                append(SMSMessage(
                     index=idx, 
                     status=stat, 
                     sender=sender, 
@@ -349,13 +410,11 @@ class SMS:
                 text = line
         
         if header:
-            match = re.search(
-                r'\+CMGR:\s*\"([^\"]+)\",\"([^\"]*)\".*\"([^\"]*)\"', 
-                header
-            )
-            stat = match.group(1) if match else ""
-            sender = match.group(2) if match else ""
-            ts = match.group(3) if match else ""
+            match = _CMGR_RE.match(header)
+            if match:
+                stat, sender, _, ts = match.groups("")
+            else:
+                stat, sender, ts = "", "", ""
             
             out.append(SMSMessage(
                 index=index, 
@@ -3,17 +3,17 @@ from usim800.Communicate import communicate
 from usim800.Request import request
 from usim800.Info import info
 from usim800.session import Sim800Session
-
-import serial
+from usim800.at import ATChannel
 
 class sim800(communicate):
     TIMMEOUT = 1
     TIMEOUT = 1
 
     def __init__(self, baudrate, path):
-        self.port = serial.Serial(path, baudrate, timeout=sim800.TIMMEOUT)
+        self._at = ATChannel(path, baudrate, timeout=sim800.TIMMEOUT)
+        self.port = self._at.ser
         super().__init__(self.port)
-        self.requests = request(self.port)
+        self.requests = request(self._at)
         self.info = info(self.port)
         self.sms = sms(self.port)
 